@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+import argparse
+import time
+
+import numpy as np
+
+from natural.ants import ACA, BatchACA, cluster_quality, run_multiresolution, seed
+from natural.particles import Swarm
+
+
+def objective(x):
+    """The prob2.py objective, with its constants in the same precision as x."""
+    real = np.asarray(x).dtype.type
+    return real(2) ** (-2 * ((x - real(0.1)) / real(0.9)) ** 2) * np.sin(real(5 * np.pi) * x) ** 6
+
+
+def timed(func, *args, **kwargs):
+    """Call the given function, and return its runtime along with its result."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def precision(args):
+    """Compare the throughput and solution quality of float64 and float32 runs."""
+    print("dtype    | swarm time (s) | f(optimum) | aca time (s) | cluster quality")
+    for dtype in (np.float64, np.float32):
+        swarm_times, optima, aca_times, qualities = [], [], [], []
+        for s in range(args.seeds):
+            seed(s)
+            swarm = Swarm(args.particles, 2.05, 2.05, 0, 1, -0.1, 0.1, dtype=dtype)
+            t, (opt, _, _) = timed(swarm.optimize, objective, args.iterations, verbose=False)
+            swarm_times.append(t)
+            optima.append(objective(opt))
+
+            seed(s)
+            aca = ACA((args.width, args.height), args.colors, args.ants, 1, 0.1, 0.1, dtype=dtype)
+            t, _ = timed(aca.run, args.iterations)
+            aca_times.append(t)
+            qualities.append(aca.quality())
+
+        print(
+            f"{np.dtype(dtype).name:8} | {np.mean(swarm_times):14.3f} | {np.mean(optima):10.6f} | "
+            f"{np.mean(aca_times):12.3f} | {np.mean(qualities):15.4f}"
+        )
+
+
+class Until:
+    """An ACA.run() callback that stops the run once the grid reaches the target quality."""
+
+    def __init__(self, target, check):
+        self.target = target
+        self.check = check
+        self.iterations = 0
+
+    def __call__(self, i, aca):
+        self.iterations = i + 1
+        return self.iterations % self.check == 0 and aca.quality() >= self.target
+
+
+def multires(args):
+    """Compare the iterations and time to reach a target quality with and without coarse levels."""
+    # The projected quality is the quality when the ants start on the original grid, so it shows how
+    # much of the final quality is owed to the coarse levels.
+    print("levels | iterations | time (s) | projected quality | cluster quality")
+    for levels in (1, args.levels):
+        iterations, times, projected, qualities = [], [], [], []
+        for s in range(args.seeds):
+            seed(s)
+            aca = ACA((args.width, args.height), args.colors, args.ants, 1, 0.1, 0.1)
+            until = Until(args.target, args.check)
+
+            if levels == 1:
+                objects = aca.grid[:, :, 0].copy()
+                t, _ = timed(aca.run, args.iterations, callback=until)
+                iterations.append(until.iterations)
+            else:
+                t, objects = timed(
+                    run_multiresolution,
+                    aca,
+                    args.coarse_iterations,
+                    levels=levels,
+                    block=args.block,
+                    fine_iters=args.iterations,
+                    callback=until,
+                )
+                # The intermediate levels always run for all of their iterations.
+                intermediate = (levels - 2) * args.iterations
+                iterations.append(args.coarse_iterations + intermediate + until.iterations)
+
+            times.append(t)
+            projected.append(cluster_quality(objects))
+            qualities.append(aca.quality())
+
+        print(
+            f"{levels:6} | {np.mean(iterations):10.0f} | {np.mean(times):8.3f} | "
+            f"{np.mean(projected):17.4f} | {np.mean(qualities):15.4f}"
+        )
+
+
+def memory(args):
+    """Compare the iterations and time to reach a target quality with and without ant memory."""
+    print("memory | iterations | time (s) | cluster quality")
+    for size in (0, args.memory):
+        iterations, times, qualities = [], [], []
+        for s in range(args.seeds):
+            seed(s)
+            aca = ACA(
+                (args.width, args.height),
+                args.colors,
+                args.ants,
+                1,
+                0.1,
+                0.1,
+                memory=size,
+                bias=args.bias,
+            )
+            until = Until(args.target, args.check)
+            t, _ = timed(aca.run, args.iterations, callback=until)
+
+            iterations.append(until.iterations)
+            times.append(t)
+            qualities.append(aca.quality())
+
+        print(
+            f"{size:6} | {np.mean(iterations):10.0f} | {np.mean(times):8.3f} | "
+            f"{np.mean(qualities):15.4f}"
+        )
+
+
+def active(args):
+    """Compare the time and quality of updating every ant against only updating the active ants."""
+    print("mode     | time (s) | cluster quality")
+    for mode, kwargs in (
+        ("all", {}),
+        ("active", {"active": True}),
+        ("relocate", {"active": True, "relocate": True}),
+    ):
+        times, qualities = [], []
+        for s in range(args.seeds):
+            seed(s)
+            aca = ACA((args.width, args.height), args.colors, args.ants, 1, 0.1, 0.1, **kwargs)
+            t, _ = timed(aca.run, args.iterations)
+            times.append(t)
+            qualities.append(aca.quality())
+
+        print(f"{mode:8} | {np.mean(times):8.3f} | {np.mean(qualities):15.4f}")
+
+
+def batch(args):
+    """Compare running replicates one ACA at a time against running them in one BatchACA."""
+    print("engine   | replicates | time (s) | cluster quality")
+    seed(0)
+    qualities, start = [], time.perf_counter()
+    for _ in range(args.replicates):
+        aca = ACA((args.width, args.height), args.colors, args.ants, 1, 0.1, 0.1)
+        aca.run(args.iterations)
+        qualities.append(aca.quality())
+    t = time.perf_counter() - start
+    print(f"{'ACA':8} | {args.replicates:10} | {t:8.3f} | {np.mean(qualities):15.4f}")
+
+    for parallel in (False, True):
+        np.random.seed(0)
+        t, aca = timed(
+            BatchACA,
+            args.replicates,
+            (args.width, args.height),
+            args.colors,
+            args.ants,
+            1,
+            0.1,
+            0.1,
+            parallel=parallel,
+        )
+        t += timed(aca.run, args.iterations)[0]
+        name = "parallel" if parallel else "serial"
+        print(f"{name:8} | {args.replicates:10} | {t:8.3f} | {np.mean(aca.quality()):15.4f}")
+
+
+def parse_args():
+    # The options shared by every benchmark.
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--seeds", type=int, default=3, help="The number of runs to average.")
+    common.add_argument(
+        "--iterations", "-i", type=int, default=100, help="The number of iterations to run."
+    )
+    common.add_argument("--width", "-x", type=int, default=200, help="The width of the grid.")
+    common.add_argument("--height", "-y", type=int, default=200, help="The height of the grid.")
+    common.add_argument("--ants", "-s", type=int, default=500, help="The number of ants to use.")
+    common.add_argument(
+        "--colors",
+        nargs="+",
+        type=int,
+        default=[100, 100],
+        help="The number of objects to use for each color.",
+    )
+    common.add_argument(
+        "--particles", "-p", type=int, default=1000, help="The number of particles in the swarm."
+    )
+
+    parser = argparse.ArgumentParser(description="Benchmark the ACA and PSO implementations.")
+    subparsers = parser.add_subparsers(dest="benchmark")
+    subparsers.required = True
+
+    p = subparsers.add_parser("precision", parents=[common], help="Compare float64 and float32.")
+    p.set_defaults(func=precision)
+
+    p = subparsers.add_parser(
+        "multires", parents=[common], help="Compare coarse-to-fine and single level clustering."
+    )
+    p.add_argument("--target", type=float, default=0.3, help="The cluster quality to reach.")
+    p.add_argument("--check", type=int, default=10, help="How often to check the quality.")
+    p.add_argument("--levels", type=int, default=2, help="The number of levels.")
+    p.add_argument("--block", type=int, default=4, help="The downsampling between levels.")
+    p.add_argument(
+        "--coarse-iterations", type=int, default=1000, help="The iterations on the coarsest level."
+    )
+    p.set_defaults(func=multires)
+
+    p = subparsers.add_parser(
+        "memory", parents=[common], help="Compare ants with and without memory."
+    )
+    p.add_argument("--target", type=float, default=0.2, help="The cluster quality to reach.")
+    p.add_argument("--check", type=int, default=10, help="How often to check the quality.")
+    p.add_argument("--memory", type=int, default=5, help="The locations to remember per color.")
+    p.add_argument("--bias", type=float, default=0.9, help="The bias towards remembered places.")
+    p.set_defaults(func=memory)
+
+    p = subparsers.add_parser(
+        "active", parents=[common], help="Compare updating every ant and only the active ants."
+    )
+    p.set_defaults(func=active)
+
+    p = subparsers.add_parser(
+        "batch", parents=[common], help="Compare separate ACAs and a replicate batched BatchACA."
+    )
+    p.add_argument("--replicates", type=int, default=8, help="The number of replicates to run.")
+    p.set_defaults(func=batch)
+
+    return parser.parse_args()
+
+
+def main(args):
+    print(args)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -1,2 +1,6 @@
 from .aca import ACA
-from .ant import Ant
+from .ant import Ant, Ant32, seed
+from .batch import BatchACA
+from .index import ObjectIndex
+from .multires import coarsen, refine, run_multiresolution
+from .quality import cluster_quality
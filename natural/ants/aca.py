@@ -3,7 +3,11 @@ import numba
 import numpy as np
 from matplotlib.colors import ListedColormap
 
-from .ant import Ant
+from .. import raster
+from .ant import Ant, Ant32
+from .constants import EMPTY
+from .index import ObjectIndex
+from .quality import cluster_quality
 
 
 @numba.jit(nopython=True, cache=True)
@@ -67,7 +71,21 @@ class ACA:
     of iterations, and optionally animates the clustering progress.
     """
 
-    def __init__(self, grid_size, colors, num_ants, radius, k1, k2):
+    def __init__(
+        self,
+        grid_size,
+        colors,
+        num_ants,
+        radius,
+        k1,
+        k2,
+        dtype=np.float64,
+        objects=None,
+        memory=0,
+        bias=0.5,
+        active=False,
+        relocate=False,
+    ):
         """Initialize a random Grid and set up for proceding with the ACA algorithm.
 
         :param grid_size: A (width, height) tuple specifying the grid size.
@@ -78,6 +96,18 @@ class ACA:
         :param radius: Each ant's sight distance.
         :param k1: A tunable parameter for the pickup probability.
         :param k2: A tunable parameter for the dropoff probability.
+        :param dtype: The float type the ants calculate their probabilities with. Either
+        np.float64 (the default) or np.float32.
+        :param objects: An optional (width, height) array of object colors to start from, instead
+        of scattering the objects randomly. See ACA.from_objects().
+        :param memory: The number of drop off locations each ant remembers per color. Defaults
+        to 0, for ants without memory.
+        :param bias: The probability that a loaded ant with memory heads towards a remembered
+        location instead of stepping randomly.
+        :param active: Whether to only fully update the ants that might see an object, and move
+        the rest all at once. See ACA.update_active().
+        :param relocate: Whether to relocate the ants that can't see an object near objects,
+        instead of moving them randomly. Only used if `active` is set.
         """
         self.width, self.height = grid_size
         self.num_ants = num_ants
@@ -85,12 +115,29 @@ class ACA:
         self.k1 = k1
         self.k2 = k2
         self.colors = colors
+        self.memory = memory
+        self.bias = bias
+        self.dtype = np.dtype(dtype)
+        assert self.dtype in (np.float64, np.float32), "Only float64 and float32 are supported."
         self.grid = None
-        self.init_grid()
+        self.init_grid(objects)
+        self.relocate = relocate
+        self.index = ObjectIndex(self.grid[:, :, 0], radius) if active else None
+        self.state = None
+        self.stale = None
         self.ants = None
         self.init_ants()
 
-    def init_grid(self):
+    @classmethod
+    def from_objects(cls, objects, num_ants, radius, k1, k2, **kwargs):
+        """Initialize an ACA with the objects from an existing (width, height) array of colors.
+
+        The other parameters are the same as for ACA.__init__().
+        """
+        colors = [int(np.sum(objects == c)) for c in range(1, objects.max() + 1)]
+        return cls(objects.shape, colors, num_ants, radius, k1, k2, objects=objects, **kwargs)
+
+    def init_grid(self, objects=None):
         """Get a randomly initialized grid of objects.
 
         The grid is a 2D array of (color, ant) tuples, where color is
@@ -105,7 +152,15 @@ class ACA:
 
         The Ant object is also responsible for managing the ant value when it
         moves from cell to cell.
+
+        :param objects: An optional (width, height) array of object colors to use instead of
+        scattering the objects randomly.
         """
+        if objects is not None:
+            self.grid = np.zeros((self.width, self.height, 2), dtype=int)
+            self.grid[:, :, 0] = objects
+            return
+
         num_objects = sum(self.colors)
         assert (
             num_objects <= self.width * self.height
@@ -136,32 +191,130 @@ class ACA:
         for i in indices:
             x = i % self.width
             y = i // self.width
-            ant = Ant(x, y, self.k1, self.k2)
+            ant = (Ant32 if self.dtype == np.float32 else Ant)(x, y, self.k1, self.k2)
+            if self.memory > 0:
+                ant.init_memory(len(self.colors), self.memory, self.bias)
             ants.append(ant)
             self.grid[x, y, 1] = 1
 
         self.ants = ants
+        self.cache_ants()
 
     def update(self):
         """Perform one iteration of the ACA."""
+        if self.index is not None:
+            self.update_active()
+            return
+
         for ant in self.ants:
             kernel = kernel_center(self.grid, ant.x, ant.y, self.radius)
             ant.update(kernel, *kernel_coords((ant.x, ant.y), self.radius))
 
+    def update_active(self):
+        """Perform one iteration of the ACA, only paying for a full update where it matters.
+
+        An unloaded ant that can't see any objects can't do anything but wander around. So only
+        the ants that are loaded or might see an object are updated one at a time. The rest are
+        moved all at once, or relocated near objects if `relocate` is set.
+
+        Reading and writing the jitclass attributes from Python is as expensive as the update
+        itself, so the ants' (x, y, load) states are cached in a numpy array. The idle ants are
+        moved in the cache, and only written back once they become active. See ACA.sync_ants().
+
+        NOTE: Which ants are idle is decided at the start of the iteration, so an idle ant won't
+        notice an object dropped in sight of it until the next iteration.
+        """
+        xs, ys, loads = self.state[:, 0], self.state[:, 1], self.state[:, 2]
+        idle = (loads == EMPTY) & ~self.index.near(xs, ys)
+
+        for i in np.flatnonzero(~idle):
+            ant, x, y, load = self.ants[i], xs[i], ys[i], loads[i]
+            if self.stale[i]:
+                ant.x, ant.y = x, y
+                self.stale[i] = False
+
+            kernel = kernel_center(self.grid, x, y, self.radius)
+            ant.update(kernel, *kernel_coords((x, y), self.radius))
+
+            # Keep the index up to date with any pickups or drop offs.
+            new_load = ant.load
+            if new_load != load:
+                self.index.add(x, y, 1 if new_load == EMPTY else -1)
+            self.state[i] = ant.x, ant.y, new_load
+
+        self.move_idle(np.flatnonzero(idle))
+
+    def move_idle(self, idle):
+        """Move the given idle ants all at once.
+
+        Each ant takes a random step within its radius, or jumps near a random object if
+        `relocate` is set. If the destination is occupied by another ant, the ant stays put.
+
+        :param idle: The indices of the ants to move.
+        """
+        if len(idle) == 0:
+            return
+
+        xs, ys = self.state[idle, 0], self.state[idle, 1]
+        if self.relocate:
+            new_xs, new_ys = self.index.sample(len(idle))
+        else:
+            steps = np.random.randint(-self.radius, self.radius + 1, size=(2, len(idle)))
+            new_xs = np.clip(xs + steps[0], 0, self.width - 1)
+            new_ys = np.clip(ys + steps[1], 0, self.height - 1)
+
+        # Only move to cells without an ant, and only one ant to any cell.
+        _, first = np.unique(new_xs * self.height + new_ys, return_index=True)
+        moving = np.zeros(len(idle), dtype=bool)
+        moving[first] = True
+        moving &= self.grid[new_xs, new_ys, 1] == EMPTY
+
+        self.grid[xs[moving], ys[moving], 1] = EMPTY
+        self.grid[new_xs[moving], new_ys[moving], 1] = 1
+        self.state[idle[moving], 0] = new_xs[moving]
+        self.state[idle[moving], 1] = new_ys[moving]
+        self.stale[idle[moving]] = True
+
+    def sync_ants(self):
+        """Write the cached positions of the ants moved by update_active() back to the ants."""
+        if self.index is None:
+            return
+
+        for i in np.flatnonzero(self.stale):
+            self.ants[i].x, self.ants[i].y = self.state[i, 0], self.state[i, 1]
+        self.stale[:] = False
+
+    def cache_ants(self):
+        """Cache the ants' (x, y, load) states for update_active()."""
+        if self.index is None:
+            return
+
+        self.state = np.array([(ant.x, ant.y, ant.load) for ant in self.ants], dtype=int)
+        self.stale = np.zeros(len(self.ants), dtype=bool)
+
     def drop_items(self):
         """Force every ant to drop their items."""
+        self.sync_ants()
         for ant in self.ants:
             k = kernel_center(self.grid, ant.x, ant.y, self.radius)
             k_x, k_y = kernel_coords((ant.x, ant.y), self.radius)
-            ant.dropoff(k, k_x, k_y)
+            # Unloaded ants may be standing on an object, which dropping nothing would erase.
+            if ant.load != EMPTY:
+                ant.dropoff(k, k_x, k_y)
             ant.update_location(k, k_x, k_y)
 
-    def run(self, iters, period=None, animate=False):
+        if self.index is not None:
+            self.index.rebuild(self.grid[:, :, 0])
+            self.cache_ants()
+
+    def run(self, iters, period=None, animate=False, callback=None):
         """Run the specified number of iterations of the ACA.
 
         :param iters: The number of iterations to run the ACA.
         :param period: How often to force the ants to drop all of their items.
         :param animate: Whether or not to plot the progress of the ACA, defaults to False
+        :param callback: An optional callable called as callback(i, self) after each iteration.
+        If it returns True, the run stops early.
         :returns: The grid after the final iteration.
         """
         for i in range(iters):
@@ -174,8 +327,23 @@ class ACA:
             if period is not None and i % period == 0:
                 self.drop_items()
 
+            if callback is not None and callback(i, self):
+                break
+
         self.drop_items()
 
+    def quality(self):
+        """Score how well clustered the grid is. See cluster_quality()."""
+        return cluster_quality(self.grid[:, :, 0])
+
+    def save(self, path, size=None):
+        """Save the grid as a PNG or PPM image, without going through matplotlib.
+
+        :param path: The image file to write.
+        :param size: Downsample grids that don't fit in this (width, height). See raster.render().
+        """
+        raster.save(path, raster.render(self.grid[:, :, 0], size))
+
     def plot(self, blocking=False):
         """Plot the grid.
 
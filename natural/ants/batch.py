@@ -0,0 +1,240 @@
+import numba
+import numpy as np
+
+from .constants import EMPTY
+from .quality import cluster_quality
+
+
+@numba.jit(nopython=True, cache=True)
+def _perceived_fraction(grid, x1, x2, y1, y2, color):
+    """Get the fraction of the other cells in the neighborhood holding the given color."""
+    count = 0
+    for i in range(x1, x2 + 1):
+        for j in range(y1, y2 + 1):
+            if grid[i, j, 0] == color:
+                count += 1
+    return count / ((x2 - x1 + 1) * (y2 - y1 + 1) - 1)
+
+
+@numba.jit(nopython=True, cache=True)
+def _step(grid, x, y, load, x1, x2, y1, y2):
+    """Step to a random cell in the neighborhood free of ants (and objects, if loaded).
+
+    The candidate cells are counted in the same order as np.where() in Ant.update_location(), so
+    the same random draw picks the same cell.
+
+    :returns: The new (x, y) location, which is unchanged if the ant is boxed in.
+    """
+    count = 0
+    for i in range(x1, x2 + 1):
+        for j in range(y1, y2 + 1):
+            if grid[i, j, 1] == EMPTY and (load == EMPTY or grid[i, j, 0] == EMPTY):
+                count += 1
+    if count == 0:
+        return x, y
+
+    pick = np.random.randint(count)
+    for i in range(x1, x2 + 1):
+        for j in range(y1, y2 + 1):
+            if grid[i, j, 1] == EMPTY and (load == EMPTY or grid[i, j, 0] == EMPTY):
+                if pick == 0:
+                    grid[x, y, 1] = EMPTY
+                    grid[i, j, 1] = 1
+                    return i, j
+                pick -= 1
+    return x, y
+
+
+@numba.jit(nopython=True, cache=True)
+def _update(grid, xs, ys, loads, a, radius, k1, k2):
+    """Update the a'th ant the same way as Ant.update() does."""
+    x, y, load = xs[a], ys[a], loads[a]
+    width, height = grid.shape[:2]
+    x1, x2 = max(0, x - radius), min(width - 1, x + radius)
+    y1, y2 = max(0, y - radius), min(height - 1, y + radius)
+
+    color = grid[x, y, 0]
+    if load == EMPTY and color != EMPTY:
+        f = _perceived_fraction(grid, x1, x2, y1, y2, color)
+        if np.random.random() <= (k1 / (k1 + f)) ** 2:
+            load = color
+            grid[x, y, 0] = EMPTY
+    elif load != EMPTY and color == EMPTY:
+        f = _perceived_fraction(grid, x1, x2, y1, y2, load)
+        if np.random.random() <= (2 * f if f < k2 else 1.0):
+            grid[x, y, 0] = load
+            load = EMPTY
+
+    xs[a], ys[a] = _step(grid, x, y, load, x1, x2, y1, y2)
+    loads[a] = load
+
+
+@numba.jit(nopython=True, cache=True)
+def _drop(grid, xs, ys, loads, radius):
+    """Force every ant to drop its load, and take a step, the same way as ACA.drop_items() does."""
+    width, height = grid.shape[:2]
+    for a in range(len(xs)):
+        x, y = xs[a], ys[a]
+        if loads[a] != EMPTY:
+            grid[x, y, 0] = loads[a]
+            loads[a] = EMPTY
+        x1, x2 = max(0, x - radius), min(width - 1, x + radius)
+        y1, y2 = max(0, y - radius), min(height - 1, y + radius)
+        xs[a], ys[a] = _step(grid, x, y, EMPTY, x1, x2, y1, y2)
+
+
+@numba.jit(nopython=True, cache=True)
+def _run(grid, xs, ys, loads, radius, k1, k2, iters, period, seed):
+    """Run a single replicate the same way as ACA.run() does. A period of 0 never drops."""
+    # numba keeps a random state per thread, so seed it for each replicate, rather than relying
+    # on which thread the replicate happens to run on.
+    np.random.seed(seed)
+    for i in range(iters):
+        for a in range(len(xs)):
+            _update(grid, xs, ys, loads, a, radius, k1, k2)
+        if period > 0 and i % period == 0:
+            _drop(grid, xs, ys, loads, radius)
+    _drop(grid, xs, ys, loads, radius)
+
+
+@numba.jit(nopython=True, cache=True)
+def _run_serial(grids, xs, ys, loads, radius, k1, k2, iters, period, seeds):
+    for r in range(len(grids)):
+        _run(grids[r], xs[r], ys[r], loads[r], radius, k1, k2, iters, period, seeds[r])
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def _run_parallel(grids, xs, ys, loads, radius, k1, k2, iters, period, seeds):
+    for r in numba.prange(len(grids)):
+        _run(grids[r], xs[r], ys[r], loads[r], radius, k1, k2, iters, period, seeds[r])
+
+
+class BatchACA:
+    """Run many independent replicates of the same ACA at once.
+
+    Instead of a list of Ant objects per replicate, the replicates' grids are stacked into one
+    (replicates, width, height, 2) array, and their ants into (replicates, ants) arrays of
+    coordinates and loads. Each call to BatchACA.run() advances every replicate in a single
+    compiled call, with the replicates spread over the CPU cores.
+
+    Each replicate behaves exactly like an ACA with the same parameters, but without the ACA's
+    optional ant memory, float32 mode, and active ant updates.
+
+    NOTE: numba's TBB threading layer isn't fork safe. If a process runs a parallel batch with it,
+    and then forks worker processes, it hangs. Start the workers with the "forkserver" or "spawn"
+    multiprocessing start methods instead, like JobService and tune() do.
+    """
+
+    def __init__(self, replicates, grid_size, colors, num_ants, radius, k1, k2, parallel=True):
+        """Initialize the given number of random replicates.
+
+        Each replicate draws its objects and ants the same way as ACA.__init__() does, so seeding
+        numpy and making a single replicate gives the same initial grid as an ACA.
+
+        :param replicates: The number of independent replicates.
+        :param parallel: Whether to run the replicates in parallel.
+        The other parameters are the same as for ACA.__init__().
+        """
+        self.width, self.height = grid_size
+        self.colors = colors
+        self.num_ants = num_ants
+        self.radius = radius
+        # The Ant jitclass keeps its tunable parameters in single precision.
+        self.k1 = float(np.float32(k1))
+        self.k2 = float(np.float32(k2))
+        self.parallel = parallel
+
+        self.grids = np.zeros((replicates, self.width, self.height, 2), dtype=int)
+        self.xs = np.zeros((replicates, num_ants), dtype=int)
+        self.ys = np.zeros((replicates, num_ants), dtype=int)
+        self.loads = np.zeros((replicates, num_ants), dtype=int)
+        for r in range(replicates):
+            self.init_replicate(r)
+
+    @classmethod
+    def stack(cls, acas, parallel=True):
+        """Stack the current states of existing ACAs with the same parameters into a batch.
+
+        The ACAs themselves are left untouched.
+        """
+
+        def params(aca):
+            return aca.width, aca.height, aca.num_ants, aca.radius, aca.k1, aca.k2
+
+        aca = acas[0]
+        for other in acas:
+            assert other.memory == 0, "Ant memory is not supported."
+            assert other.dtype == np.float64, "Only float64 is supported."
+            assert params(other) == params(aca), "The ACAs must have the same parameters."
+            other.sync_ants()
+
+        size = (aca.width, aca.height)
+        batch = cls(0, size, aca.colors, aca.num_ants, aca.radius, aca.k1, aca.k2, parallel)
+        batch.grids = np.stack([other.grid for other in acas]).astype(int)
+        batch.xs = np.array([[ant.x for ant in other.ants] for other in acas], dtype=int)
+        batch.ys = np.array([[ant.y for ant in other.ants] for other in acas], dtype=int)
+        batch.loads = np.array([[ant.load for ant in other.ants] for other in acas], dtype=int)
+        return batch
+
+    @property
+    def replicates(self):
+        return len(self.grids)
+
+    def init_replicate(self, r):
+        """Scatter the r'th replicate's objects and ants randomly. See ACA.init_grid()."""
+        num_objects = sum(self.colors)
+        assert (
+            num_objects <= self.width * self.height
+        ), "Too many colored objects to fit in the grid."
+        assert self.num_ants <= self.width * self.height, "Too many ants to fit in the grid."
+
+        objects = np.zeros(self.width * self.height, dtype=int)
+        indices = np.random.choice(self.height * self.width, num_objects, replace=False)
+        start = 0
+        for color, num_color in enumerate(self.colors, start=1):
+            objects[indices[start : start + num_color]] = color
+            start += num_color
+        self.grids[r, :, :, 0] = objects.reshape((self.width, self.height))
+        self.grids[r, :, :, 1] = EMPTY
+
+        # NOTE: Use the same (odd) 1D to 2D index mapping as ACA.init_ants().
+        indices = np.random.choice(self.height * self.width, self.num_ants, replace=False)
+        self.xs[r] = indices % self.width
+        self.ys[r] = indices // self.width
+        self.loads[r] = EMPTY
+        self.grids[r, self.xs[r], self.ys[r], 1] = 1
+
+    def run(self, iters, period=None, seeds=None):
+        """Run the specified number of iterations of every replicate. See ACA.run().
+
+        There's no callback, because the iterations run in a single compiled call. Call run()
+        repeatedly with fewer iterations to check on the replicates in between. Like ACA.run(),
+        every ant drops its load at the end of each call.
+
+        :param iters: The number of iterations to run.
+        :param period: How often to force the ants to drop all of their items.
+        :param seeds: The random seed for each replicate. Defaults to seeds drawn from numpy, so
+        that seeding numpy makes the whole batch reproducible.
+        """
+        if seeds is None:
+            seeds = np.random.randint(2**31 - 1, size=self.replicates)
+        seeds = np.asarray(seeds, dtype=np.int64)
+        assert len(seeds) == self.replicates, "Expected one seed per replicate."
+
+        run = _run_parallel if self.parallel else _run_serial
+        run(
+            self.grids,
+            self.xs,
+            self.ys,
+            self.loads,
+            self.radius,
+            self.k1,
+            self.k2,
+            iters,
+            period or 0,
+            seeds,
+        )
+
+    def quality(self):
+        """Score how well clustered each replicate is. See cluster_quality()."""
+        return np.array([cluster_quality(grid[:, :, 0]) for grid in self.grids])
@@ -0,0 +1,64 @@
+import numpy as np
+
+
+class ObjectIndex:
+    """A coarse spatial index of the objects on a grid.
+
+    The grid is divided into square buckets, and the index counts the objects in each bucket. The
+    buckets are at least as wide as an ant's neighborhood, so a neighborhood overlaps at most 2x2
+    buckets, and checking whether an ant might see any objects takes four lookups.
+    """
+
+    def __init__(self, objects, radius):
+        """Index the objects on the given grid for ants with the given radius.
+
+        :param objects: A (width, height) array of object colors, e.g., ACA.grid[:, :, 0].
+        :param radius: The ants' sight radius.
+        """
+        self.radius = radius
+        self.size = 2 * radius + 1
+        self.width, self.height = objects.shape
+        self.counts = None
+        self.rebuild(objects)
+
+    def rebuild(self, objects):
+        """Recount the objects in every bucket."""
+        shape = (-(-self.width // self.size), -(-self.height // self.size))
+        self.counts = np.zeros(shape, dtype=int)
+        xs, ys = np.nonzero(objects)
+        np.add.at(self.counts, (xs // self.size, ys // self.size), 1)
+
+    def add(self, x, y, count=1):
+        """Record `count` objects added to (or removed from, if negative) the cell (x, y)."""
+        self.counts[x // self.size, y // self.size] += count
+
+    def near(self, xs, ys):
+        """Check whether any objects might be in sight of ants at the given coordinates.
+
+        The check is conservative. It may report objects that are in an overlapping bucket, but
+        just out of sight.
+
+        :param xs, ys: Arrays of ant coordinates.
+        :returns: A boolean array.
+        """
+        x0 = np.maximum(xs - self.radius, 0) // self.size
+        x1 = np.minimum(xs + self.radius, self.width - 1) // self.size
+        y0 = np.maximum(ys - self.radius, 0) // self.size
+        y1 = np.minimum(ys + self.radius, self.height - 1) // self.size
+        c = self.counts
+        return (c[x0, y0] + c[x0, y1] + c[x1, y0] + c[x1, y1]) > 0
+
+    def sample(self, n):
+        """Pick n random cells in buckets that hold objects, weighted by the number of objects.
+
+        :returns: The (xs, ys) arrays of cell coordinates.
+        """
+        total = self.counts.sum()
+        if total == 0:
+            return np.random.randint(self.width, size=n), np.random.randint(self.height, size=n)
+
+        buckets = np.random.choice(self.counts.size, size=n, p=self.counts.ravel() / total)
+        bx, by = np.unravel_index(buckets, self.counts.shape)
+        xs = bx * self.size + np.random.randint(self.size, size=n)
+        ys = by * self.size + np.random.randint(self.size, size=n)
+        return np.minimum(xs, self.width - 1), np.minimum(ys, self.height - 1)
@@ -0,0 +1,133 @@
+import numpy as np
+
+from .aca import ACA, kernel_center
+from .constants import EMPTY
+
+
+def __nearest_free(grid, x, y):
+    """Find a random unoccupied cell in the smallest neighborhood of (x, y) that has one."""
+    r = 1
+    while True:
+        kernel = kernel_center(grid, x, y, r)
+        free_x, free_y = np.nonzero(kernel == EMPTY)
+        if len(free_x) > 0:
+            i = np.random.randint(len(free_x))
+            return max(0, x - r) + free_x[i], max(0, y - r) + free_y[i]
+        r += 1
+
+
+def coarsen(objects, block):
+    """Aggregate the cells of a grid into block x block cells.
+
+    Every object is kept. Each object moves to the coarse cell of its block, or the nearest free
+    coarse cell if another object already got there first.
+
+    :param objects: A (width, height) array of object colors, e.g., ACA.grid[:, :, 0].
+    :param block: The width and height of the blocks to aggregate.
+    :returns: A (ceil(width / block), ceil(height / block)) array of object colors.
+    """
+    width, height = objects.shape
+    coarse = np.zeros((-(-width // block), -(-height // block)), dtype=objects.dtype)
+    xs, ys = np.nonzero(objects)
+    assert len(xs) <= coarse.size, "Too many colored objects to fit in the coarse grid."
+
+    # Shuffle the objects, so that no color gets priority on the contested blocks.
+    order = np.random.permutation(len(xs))
+    xs, ys = xs[order], ys[order]
+    colors = objects[xs, ys]
+    cx, cy = xs // block, ys // block
+
+    # The first object in each block gets the block's coarse cell.
+    _, first = np.unique(cx * coarse.shape[1] + cy, return_index=True)
+    coarse[cx[first], cy[first]] = colors[first]
+
+    # Everything else gets bumped to the nearest free cell.
+    bumped = np.ones(len(xs), dtype=bool)
+    bumped[first] = False
+    for x, y, color in zip(cx[bumped], cy[bumped], colors[bumped]):
+        coarse[__nearest_free(coarse, x, y)] = color
+
+    return coarse
+
+
+def refine(coarse, shape, block):
+    """Project a coarse grid onto a finer grid.
+
+    This undoes coarsen(), without doing any clustering of its own. Each object moves to a random
+    cell of its coarse cell's block on the fine grid, so the clusters at the coarse level are
+    spread out by a factor of `block`, and it's up to the ants on the fine level to compact them.
+
+    :param coarse: A (width, height) array of object colors on the coarse grid.
+    :param shape: The (width, height) of the fine grid.
+    :param block: The width and height of each coarse cell in fine cells.
+    :returns: A fine (width, height) array of object colors.
+    """
+    fine = np.zeros(shape, dtype=coarse.dtype)
+    xs, ys = np.nonzero(coarse)
+    # The blocks along the far edges are cut short if the fine grid isn't a multiple of `block`.
+    widths = np.minimum(block, shape[0] - xs * block)
+    heights = np.minimum(block, shape[1] - ys * block)
+    dx = (np.random.random(len(xs)) * widths).astype(int)
+    dy = (np.random.random(len(ys)) * heights).astype(int)
+    # Each block holds at most one object, so they never collide.
+    fine[xs * block + dx, ys * block + dy] = coarse[xs, ys]
+    return fine
+
+
+def run_multiresolution(aca, iters, levels=2, block=2, fine_iters=None, period=None, callback=None):
+    """Run the ACA coarse-to-fine.
+
+    First cluster on the grid downsampled `levels - 1` times by `block`, where carrying an object
+    between distant clusters takes a fraction of the steps. Then project the result onto each
+    finer level in turn, and continue clustering there with fewer iterations.
+
+    The ants keep the same radius (in cells) at every level, so at the coarse levels they see a
+    much larger part of the original grid.
+
+    :param aca: The ACA to cluster. Its grid is updated in place.
+    :param iters: The number of iterations to run on the coarsest level.
+    :param levels: The number of levels, including the original grid.
+    :param block: The downsampling factor between levels.
+    :param fine_iters: The number of iterations to run on each finer level. Defaults to a tenth
+    of `iters`.
+    :param period: How often to force the ants to drop all of their items. See ACA.run().
+    :param callback: An optional callback for the iterations on the original grid. See ACA.run().
+    :returns: The objects as they were projected onto the original grid, before its iterations.
+    """
+    if fine_iters is None:
+        fine_iters = max(1, iters // 10)
+
+    grids = [aca.grid[:, :, 0].copy()]
+    for _ in range(levels - 1):
+        grids.append(coarsen(grids[-1], block))
+
+    objects = grids.pop()
+    level_iters = iters
+    while grids:
+        # Use as many ants as the original grid, as long as they have room to move around.
+        ants = min(aca.num_ants, (objects.size - np.count_nonzero(objects)) // 2)
+        coarse = ACA.from_objects(
+            objects,
+            ants,
+            aca.radius,
+            aca.k1,
+            aca.k2,
+            dtype=aca.dtype,
+            memory=aca.memory,
+            bias=aca.bias,
+            active=aca.index is not None,
+            relocate=aca.relocate,
+        )
+        coarse.run(level_iters, period=period)
+
+        objects = refine(coarse.grid[:, :, 0], grids.pop().shape, block)
+        level_iters = fine_iters
+
+    # Start over with the ants on the original grid.
+    aca.grid[:, :, 0] = objects
+    aca.grid[:, :, 1] = EMPTY
+    if aca.index is not None:
+        aca.index.rebuild(objects)
+    aca.init_ants()
+    aca.run(level_iters, period=period, callback=callback)
+    return objects
@@ -0,0 +1,29 @@
+import numpy as np
+
+from .constants import EMPTY
+
+
+def cluster_quality(objects):
+    """Score how well clustered the objects on a grid are.
+
+    The score is the mean fraction of each object's eight neighbors that hold an object of the same
+    color. A grid of randomly scattered objects scores close to 0, and a grid of perfectly compact
+    single colored clusters scores close to 1 (only the objects on a cluster's border lose points).
+
+    :param objects: A (width, height) array of object colors, e.g., ACA.grid[:, :, 0].
+    """
+    occupied = objects != EMPTY
+    if not occupied.any():
+        return 0.0
+
+    width, height = objects.shape
+    padded = np.pad(objects, 1, mode="constant", constant_values=EMPTY)
+    same = np.zeros(objects.shape, dtype=int)
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            if dx == dy == 0:
+                continue
+            neighbors = padded[1 + dx : 1 + dx + width, 1 + dy : 1 + dy + height]
+            same += neighbors == objects
+
+    return same[occupied].mean() / 8
@@ -1 +1,2 @@
+from .surrogate import Surrogate
 from .swarm import Swarm
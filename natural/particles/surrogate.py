@@ -0,0 +1,88 @@
+import math
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class Surrogate:
+    """A cheap model of an expensive objective function, used to pre-screen particles.
+
+    The surrogate keeps an archive of every (position, fitness) pair the objective has actually
+    been evaluated at, indexed by a k-d tree. It predicts the fitness of unevaluated positions by
+    inverse distance weighting the fitness of their nearest archived neighbors.
+
+    Each iteration, only the particles with the most promising predictions are evaluated with the
+    real objective.
+    """
+
+    def __init__(self, budget, neighbors=4):
+        """Construct an empty surrogate model.
+
+        :param budget: The fraction (0, 1] of the swarm to evaluate with the real objective each
+        iteration.
+        :param neighbors: The number of archived neighbors to predict from.
+        """
+        assert 0 < budget <= 1, "The real evaluation budget must be a fraction in (0, 1]."
+        self.budget = budget
+        self.neighbors = neighbors
+
+        self.positions = []
+        self.fitness = []
+        self.tree = None
+
+        # The number of real evaluations made, and the number skipped by pre-screening.
+        self.evaluations = 0
+        self.saved = 0
+
+    def evaluate(self, func, x):
+        """Evaluate the real objective at x, and add the result to the archive.
+
+        :param func: The (expensive) objective function.
+        :param x: A single position, or an array of positions if func is vectorized.
+        """
+        fx = func(x)
+        positions = np.reshape(x, (np.size(fx), -1))
+        self.positions.extend(positions)
+        self.fitness.extend(np.ravel(fx))
+        self.evaluations += len(positions)
+        # The k-d tree is static, so rebuild it lazily the next time it's needed.
+        self.tree = None
+        return fx
+
+    def predict(self, x):
+        """Predict the fitness at each of the given positions."""
+        if self.tree is None:
+            self.tree = cKDTree(np.array(self.positions))
+
+        x = np.reshape(x, (len(x), -1))
+        k = min(self.neighbors, len(self.fitness))
+        distances, indices = self.tree.query(x, k=k)
+        distances = np.reshape(distances, (len(x), k))
+        indices = np.reshape(indices, (len(x), k))
+
+        fitness = np.array(self.fitness)[indices]
+        # Positions that have already been evaluated exactly are predicted exactly.
+        exact = distances[:, 0] == 0
+        with np.errstate(divide="ignore"):
+            weights = 1 / distances
+        weights[exact] = 0
+        weights[exact, 0] = 1
+        return np.sum(weights * fitness, axis=1) / np.sum(weights, axis=1)
+
+    def screen(self, particles):
+        """Pick which of the given particles are worth evaluating with the real objective.
+
+        :returns: A boolean mask of the particles to evaluate.
+        """
+        n = len(particles)
+        mask = np.ones(n, dtype=bool)
+        # Don't trust the model until it has enough data to make a prediction from.
+        if len(self.fitness) < self.neighbors:
+            return mask
+
+        k = max(1, math.ceil(self.budget * n))
+        promising = np.argsort(self.predict(particles))[::-1][:k]
+        mask[:] = False
+        mask[promising] = True
+        self.saved += n - k
+        return mask
@@ -1,75 +1,231 @@
+import concurrent.futures
+
 import matplotlib.pyplot as plt
 import numpy as np
 
 
 class Swarm:
-    """Optimize a function of one variable using a particle swarm."""
+    """Optimize a function of one or more variables using a particle swarm."""
 
-    def __init__(self, particles, AC1, AC2, xmin, xmax, vmin, vmax):
+    def __init__(
+        self, particles, AC1, AC2, xmin, xmax, vmin, vmax, surrogate=None, dtype=np.float64
+    ):
         """Construct a particle swarm with a number of tunable parameters.
 
         :param particles: The number of particles in the swarm.
         :param AC1: The acceleration constant for the particle's best position component.
         :param AC2: The acceleration constant for the swarm's best position component.
-        :param xmin, xmax: The domain bounds to optimize over.
-        :param vmin, vmax: The velocity bounds on each particle.
+        :param xmin, xmax: The domain bounds to optimize over. Pass arrays of per-dimension bounds
+        to optimize a function of several variables.
+        :param vmin, vmax: The velocity bounds on each particle, either scalars or per-dimension.
+        :param surrogate: An optional Surrogate model used to skip evaluating unpromising
+        particles with the real objective function.
+        :param dtype: The float type to store and update the swarm with. Use np.float32 to halve
+        the memory bandwidth needed by large swarms.
         """
         self.num_particles = particles
-        self.AC1, self.AC2 = AC1, AC2
-        self.xmin, self.xmax = xmin, xmax
-        self.vmin, self.vmax = vmin, vmax
+        self.dtype = np.dtype(dtype)
+        # Keep the parameters in the same type as the swarm, so they don't upcast the updates.
+        real = self.dtype.type
+        self.AC1, self.AC2 = real(AC1), real(AC2)
+        self.xmin, self.xmax = self.__bound(xmin), self.__bound(xmax)
+        self.vmin, self.vmax = self.__bound(vmin), self.__bound(vmax)
+        # Each particle's position is a scalar, unless any of the bounds are per-dimension.
+        self.shape = np.broadcast(self.xmin, self.xmax, self.vmin, self.vmax).shape
 
-        self.particles = np.random.uniform(low=xmin, high=xmax, size=particles)
-        self.velocities = np.random.uniform(low=vmin, high=vmax, size=particles)
+        # NOTE: numpy's random module only draws doubles, so they have to be converted.
+        size = (particles,) + self.shape
+        self.particles = np.random.uniform(low=xmin, high=xmax, size=size).astype(dtype)
+        self.velocities = np.random.uniform(low=vmin, high=vmax, size=size).astype(dtype)
         # Each particle's best historical position.
         self.history = self.particles.copy()
         # The entire swarm's best historical position.
         self.best = None
+        # Cache the fitness of the historical best positions to avoid re-evaluating them.
+        self.history_fitness = None
+        self.best_fitness = None
+        self.surrogate = surrogate
+
+    def __bound(self, value):
+        """Convert a scalar or per-dimension bound to the swarm's dtype."""
+        value = np.asarray(value, dtype=self.dtype)
+        # Unwrap scalars, because they're much faster than 0d arrays in the per-particle updates.
+        return value[()] if value.ndim == 0 else value
+
+    def status(self):
+        """Format the best position and its fitness for printing."""
+        if np.ndim(self.best) == 0:
+            return "f({:.04f}) = {:.04f}".format(self.best, self.best_fitness)
+        x = ", ".join("{:.04f}".format(xi) for xi in self.best)
+        return "f({}) = {:.04f}".format(x, self.best_fitness)
+
+    def evaluate(self, func, x):
+        """Evaluate the objective, and record the result with the surrogate if there is one."""
+        if self.surrogate is None:
+            return func(x)
+        return self.surrogate.evaluate(func, x)
 
     def update(self, func):
         """Perform one iteration of optimization."""
+        if self.surrogate is None:
+            screened = np.ones(self.num_particles, dtype=bool)
+        else:
+            screened = self.surrogate.screen(self.particles)
+
         for i, x in enumerate(self.particles):
-            if func(x) > func(self.history[i]):
-                self.history[i] = x
-            if func(x) > func(self.best):
-                self.best = x
+            # Particles that didn't make it through the screening still move, but can't improve
+            # on the historical best positions without a real evaluation.
+            if screened[i]:
+                self.record(i, x, self.evaluate(func, x))
+
+            self.move(i, x)
 
-            # NOTE: The size is the number of dimensions of a single particle.
-            phi1 = np.random.uniform(low=0, high=self.AC1, size=1)
-            phi2 = np.random.uniform(low=0, high=self.AC2, size=1)
+    def record(self, i, x, fx):
+        """Record the i'th particle's fitness fx at position x in the historical bests."""
+        if fx > self.history_fitness[i]:
+            self.history[i] = x
+            self.history_fitness[i] = fx
+        if fx > self.best_fitness:
+            # Copy multidimensional positions, because x is a view of the moving particle.
+            self.best = x.copy()
+            self.best_fitness = fx
+
+    def move(self, i, x):
+        """Accelerate the i'th particle at position x towards the historical best positions."""
+        if not self.shape:
+            phi1 = self.dtype.type(np.random.uniform(low=0, high=self.AC1))
+            phi2 = self.dtype.type(np.random.uniform(low=0, high=self.AC2))
 
             # Update the particle's velocity.
             self.velocities[i] += phi1 * (self.history[i] - x) + phi2 * (self.best - x)
             # Clip the velocity between the allowable bounds.
-            # NOTE: Must be done elementwise if x is more than one dimension.
             self.velocities[i] = min(self.vmax, max(self.vmin, self.velocities[i]))
             self.particles[i] += self.velocities[i]
             self.particles[i] = min(self.xmax, max(self.xmin, self.particles[i]))
+            return
+
+        # Multidimensional particles accelerate by a different amount in each dimension.
+        phi1 = np.random.uniform(low=0, high=self.AC1, size=self.shape).astype(self.dtype)
+        phi2 = np.random.uniform(low=0, high=self.AC2, size=self.shape).astype(self.dtype)
+
+        self.velocities[i] += phi1 * (self.history[i] - x) + phi2 * (self.best - x)
+        self.velocities[i] = np.clip(self.velocities[i], self.vmin, self.vmax)
+        self.particles[i] = np.clip(self.particles[i] + self.velocities[i], self.xmin, self.xmax)
+
+    def optimize(self, func, iters, animate=False, callback=None, verbose=True):
+        """Optimize the given function for `iters` iterations.
+
+        :param func: The function to maximize. It's evaluated on the whole swarm at once to start
+        with, so it has to accept an array of positions.
+        :param iters: The number of iterations to run.
+        :param animate: Whether or not to plot the swarm's progress, defaults to False
+        :param callback: An optional callable called as callback(i, self) after each iteration.
+        If it returns True, the optimization stops early.
+        :param verbose: Whether or not to print the best value as it improves, defaults to True
+        :returns: The best position, and the per-iteration history of the best and mean positions.
+        """
+        fitness = self.evaluate(func, self.particles)
+        if np.array_equal(self.history, self.particles):
+            self.history_fitness = fitness.copy()
+        else:
+            # Repeated calls to optimize() keep the history from the previous calls.
+            self.history_fitness = self.evaluate(func, self.history)
 
-    def optimize(self, func, iters, animate=False):
-        """Optimize the given function for `iters` iterations."""
-        b = np.argmax(func(self.particles))
-        self.best = self.particles[b]
+        b = np.argmax(fitness)
+        self.best = self.particles[b].copy()
+        self.best_fitness = fitness[b]
 
-        bests = np.zeros(iters)
-        means = np.zeros(iters)
+        bests = np.zeros((iters,) + self.shape, dtype=self.dtype)
+        means = np.zeros((iters,) + self.shape, dtype=self.dtype)
 
         bests[0] = self.best
-        means[0] = self.particles.mean()
+        means[0] = self.particles.mean(axis=0)
 
         for i in range(1, iters):
-            print("\rf({:.04f}) = {:.04f}".format(self.best, func(self.best)), end="")
+            if verbose:
+                print("\r" + self.status(), end="")
             self.update(func)
 
             if animate and i % 5 == 0:
                 self.plot(func, blocking=False)
 
             bests[i] = self.best
-            means[i] = self.particles.mean()
+            means[i] = self.particles.mean(axis=0)
 
-        print()
+            if callback is not None and callback(i, self):
+                bests, means = bests[: i + 1], means[: i + 1]
+                break
+
+        if verbose:
+            print()
         return self.best, bests, means
 
+    def optimize_async(self, func, evaluations, executor=None, verbose=True):
+        """Optimize the given function asynchronously, for a budget of `evaluations` evaluations.
+
+        Instead of advancing the swarm a generation at a time, each particle moves as soon as its
+        own evaluation completes, using whatever the swarm's best position is at the time. That
+        way, no worker waits on a generation barrier for the slowest evaluation in the swarm,
+        which matters when the objective's runtime varies a lot.
+
+        NOTE: The surrogate model is not used in the asynchronous mode.
+
+        :param func: The function to maximize.
+        :param evaluations: The total number of objective evaluations to make.
+        :param executor: The concurrent.futures.Executor to evaluate the objective with. Defaults
+        to a ThreadPoolExecutor. Use a ProcessPoolExecutor for pure Python objectives, which need
+        to be picklable.
+        :param verbose: Whether or not to print the best value as it improves, defaults to True
+        :returns: The best position, and the history of the best and mean positions, sampled
+        once every `particles` evaluations.
+        """
+        if executor is None:
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                return self.optimize_async(func, evaluations, executor, verbose)
+
+        # Nothing has been evaluated yet, so any fitness is an improvement.
+        self.history_fitness = np.full(self.num_particles, -np.inf)
+        self.best = self.particles[0].copy()
+        self.best_fitness = -np.inf
+
+        bests, means = [], []
+        # Maps each in-flight evaluation to the particle it's evaluating.
+        pending = {}
+        submitted = completed = 0
+
+        def submit(i):
+            nonlocal submitted
+            pending[executor.submit(func, self.particles[i])] = i
+            submitted += 1
+
+        for i in range(min(self.num_particles, evaluations)):
+            submit(i)
+
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                i = pending.pop(future)
+                # The particle doesn't move while it's being evaluated.
+                x = self.particles[i]
+                self.record(i, x, future.result())
+                self.move(i, x)
+
+                completed += 1
+                if completed % self.num_particles == 0:
+                    bests.append(self.best)
+                    means.append(self.particles.mean(axis=0))
+                    if verbose:
+                        print("\r" + self.status(), end="")
+
+                if submitted < evaluations:
+                    submit(i)
+
+        if verbose:
+            print()
+        return self.best, np.array(bests, dtype=self.dtype), np.array(means, dtype=self.dtype)
+
     def plot(self, func, blocking=False):
         """Plot the swarm's progress on the given function.
 
@@ -0,0 +1,202 @@
+"""Render ACA grids and swarm states straight to PNG or PPM images, without matplotlib.
+
+Plotting a large grid with imshow() and saving it as an .eps is slow, and makes huge files. A
+grid of object colors already is an image, so rendering it is a palette lookup, and writing it
+is a few lines of zlib.
+"""
+
+import os
+import struct
+import zlib
+
+import numpy as np
+
+# The same colors ACA.plot() uses, as 8-bit RGB.
+PALETTE = np.array(
+    [
+        (255, 255, 255),  # white
+        (255, 0, 0),  # red
+        (0, 0, 255),  # blue
+        (0, 128, 0),  # green
+        (255, 165, 0),  # orange
+        (128, 0, 128),  # purple
+        (165, 42, 42),  # brown
+        (255, 192, 203),  # pink
+    ],
+    dtype=np.uint8,
+)
+
+
+def downsample(objects, size):
+    """Shrink a grid of object colors so that it fits in the given size.
+
+    Each block of cells becomes the most common color of the objects in the block, so sparse
+    objects don't disappear into the empty space around them.
+
+    :param objects: A (width, height) array of object colors, e.g., ACA.grid[:, :, 0].
+    :param size: The maximum (width, height) of the result.
+    :returns: The downsampled grid, or the original grid if it already fits.
+    """
+    width, height = objects.shape
+    block = max(-(-width // size[0]), -(-height // size[1]))
+    if block <= 1:
+        return objects
+
+    # Pad the grid with empty cells to a whole number of blocks.
+    w, h = -(-width // block), -(-height // block)
+    padded = np.zeros((w * block, h * block), dtype=objects.dtype)
+    padded[:width, :height] = objects
+    blocks = padded.reshape(w, block, h, block)
+
+    colors = np.arange(1, objects.max() + 1)
+    if len(colors) == 0:
+        return np.zeros((w, h), dtype=objects.dtype)
+
+    counts = np.stack([np.count_nonzero(blocks == c, axis=(1, 3)) for c in colors])
+    return np.where(counts.max(axis=0) > 0, colors[counts.argmax(axis=0)], 0)
+
+
+def render(objects, size=None, palette=PALETTE):
+    """Render a grid of object colors as an RGB image.
+
+    The image has the same orientation as ACA.plot(), with the grid's first axis as its rows. Like
+    ACA.plot(), colors past the end of the palette all get its last color.
+
+    :param objects: A (width, height) array of object colors, e.g., ACA.grid[:, :, 0].
+    :param size: Downsample grids that don't fit in this (width, height). See downsample().
+    :param palette: A (colors, 3) array of RGB values to map the object colors through.
+    :returns: A (width, height, 3) uint8 array.
+    """
+    if size is not None:
+        objects = downsample(objects, size)
+    return palette[np.minimum(objects, len(palette) - 1)]
+
+
+def render_swarm(swarm, func, size=(640, 480), samples=None):
+    """Render the state of a 1D swarm on the given function, like Swarm.plot() does.
+
+    :param swarm: The Swarm to render.
+    :param func: The function the swarm is optimizing.
+    :param size: The (width, height) of the image.
+    :param samples: The function values to scale the plot with. Defaults to the function sampled
+    once per column. Pass the same values for every frame of an animation to keep the y axis still.
+    :returns: A (height, width, 3) uint8 array.
+    """
+    width, height = size
+    image = np.full((height, width, 3), 255, dtype=np.uint8)
+    x = np.linspace(swarm.xmin, swarm.xmax, width)
+    fx = func(x)
+    if samples is None:
+        samples = fx
+    lo, hi = np.min(samples), np.max(samples)
+    scale = (height - 1) / (hi - lo) if hi > lo else 0
+
+    def rows(values):
+        return np.clip(np.round((hi - values) * scale), 0, height - 1).astype(int)
+
+    def columns(positions):
+        span = swarm.xmax - swarm.xmin
+        xs = np.round((positions - swarm.xmin) / span * (width - 1))
+        return np.clip(xs, 0, width - 1).astype(int)
+
+    def dots(positions, color, radius):
+        xs = columns(np.ravel(positions))
+        ys = rows(np.ravel(func(positions)))
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                image[np.clip(ys + dy, 0, height - 1), np.clip(xs + dx, 0, width - 1)] = color
+
+    # Draw the function as vertical segments between columns, so steep slopes stay connected.
+    ys = rows(fx)
+    top = np.minimum(ys, np.roll(ys, 1))
+    bottom = np.maximum(ys, np.roll(ys, 1))
+    top[0] = bottom[0] = ys[0]
+    row = np.arange(height)[:, np.newaxis]
+    image[(row >= top) & (row <= bottom)] = PALETTE[2]
+
+    dots(swarm.particles, PALETTE[3], 1)
+    dots(swarm.best, PALETTE[1], 2)
+    return image
+
+
+def write_png(path, image):
+    """Write an RGB image to a PNG file.
+
+    :param path: The file to write.
+    :param image: A (rows, columns, 3) uint8 array.
+    """
+    rows, columns, _ = image.shape
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    # Every row starts with a filter type byte. Filter type 0 means no filtering.
+    raw = np.zeros((rows, 1 + 3 * columns), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(rows, -1)
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        # 8-bit depth, color type 2 (RGB), default compression, filtering, and no interlacing.
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", columns, rows, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def write_ppm(path, image):
+    """Write an RGB image to a binary (P6) PPM file.
+
+    :param path: The file to write.
+    :param image: A (rows, columns, 3) uint8 array.
+    """
+    rows, columns, _ = image.shape
+    with open(path, "wb") as f:
+        f.write(f"P6\n{columns} {rows}\n255\n".encode())
+        f.write(np.ascontiguousarray(image, dtype=np.uint8).tobytes())
+
+
+def save(path, image):
+    """Write an RGB image to a PNG or PPM file, depending on the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".png":
+        write_png(path, image)
+    elif extension in (".ppm", ".pnm"):
+        write_ppm(path, image)
+    else:
+        raise ValueError(f"Unsupported image format {extension!r}, expected .png or .ppm")
+
+
+class Recorder:
+    """An ACA.run() or Swarm.optimize() callback that saves a frame every so often.
+
+    >>> recorder = Recorder("frames/aca-{:05d}.png", lambda aca: render(aca.grid[:, :, 0]))
+    >>> aca.run(1000, callback=recorder)
+    """
+
+    def __init__(self, pattern, render, period=1, callback=None):
+        """Record frames to the given files.
+
+        :param pattern: A format string for the frame file names, formatted with the iteration.
+        :param render: A callable render(state) that returns the RGB image to save.
+        :param period: How often to save a frame.
+        :param callback: Another callback to chain, whose return value is passed through.
+        """
+        self.pattern = pattern
+        self.render = render
+        self.period = period
+        self.callback = callback
+        self.frames = []
+
+        directory = os.path.dirname(pattern)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, i, state):
+        if i % self.period == 0:
+            path = self.pattern.format(i)
+            save(path, self.render(state))
+            self.frames.append(path)
+
+        if self.callback is not None:
+            return self.callback(i, state)
+        return False
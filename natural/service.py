@@ -0,0 +1,310 @@
+"""A local job service that runs ACA and PSO jobs on a pool of pre-warmed worker processes.
+
+Running a fresh interpreter for every job pays for Python startup, the matplotlib and seaborn
+imports in natural/__init__.py, and the numba JIT compilation (or cache loading) for the kernel
+functions and the Ant jitclass. For short jobs, that overhead dominates. The service pays it once
+per worker process, and then dispatches jobs to the already warm workers.
+
+Clients talk to the service with newline delimited JSON messages over a Unix socket (or TCP):
+
+    {"op": "submit", "id": "job-1", "kind": "aca", "params": {"iterations": 500}}
+    {"op": "cancel", "id": "job-1"}
+
+The service answers with a stream of events for each submitted job
+
+    {"id": "job-1", "event": "accepted"}
+    {"id": "job-1", "event": "progress", "iteration": 50}
+    {"id": "job-1", "event": "result", "iterations": 500}
+
+terminated by exactly one "result", "cancelled", or "error" event.
+"""
+
+import asyncio
+import concurrent.futures
+import importlib
+import json
+import multiprocessing
+import os
+
+import matplotlib
+
+# The workers never display anything, so don't let pyplot go looking for a display.
+matplotlib.use("Agg")
+
+import numpy as np  # noqa: E402
+
+from .ants import ACA  # noqa: E402
+from .particles import Swarm  # noqa: E402
+
+# The default job parameters are the same as the defaults of the prob1.py and prob2.py scripts.
+ACA_DEFAULTS = {
+    "width": 200,
+    "height": 200,
+    "colors": [100, 100],
+    "ants": 500,
+    "radius": 1,
+    "k1": 0.1,
+    "k2": 0.1,
+    "iterations": 100,
+    "reset_period": None,
+    "report": 10,
+    "return_grid": False,
+}
+
+PSO_DEFAULTS = {
+    "objective": None,
+    "particles": 100,
+    "ac1": 2.05,
+    "ac2": 2.05,
+    "xmin": 0,
+    "xmax": 1,
+    "vmin": -0.1,
+    "vmax": 0.1,
+    "iterations": 100,
+    "report": 10,
+}
+
+TERMINAL_EVENTS = {"result", "cancelled", "error"}
+
+# Per-worker state, set by _warm() when the worker process starts.
+_events = None
+_cancelled = None
+
+
+def _warm(events, cancelled):
+    """Initialize a worker process, and pay for the imports and JIT compilation up front."""
+    global _events, _cancelled
+    _events = events
+    _cancelled = cancelled
+
+    # Run a tiny problem through each code path, so that compiling (or loading the cached) numba
+    # functions happens now instead of during the first job.
+    ACA((5, 5), [2, 2], 2, 1, 0.1, 0.1).run(2, period=1)
+    Swarm(2, 1, 1, 0, 1, -0.1, 0.1).optimize(np.sin, iters=2, verbose=False)
+
+
+def resolve(name):
+    """Import the object named by a "package.module:attribute" string."""
+    module, _, attr = name.partition(":")
+    if not module or not attr:
+        raise ValueError(f"Expected an objective of the form 'module:function', got {name!r}")
+    return getattr(importlib.import_module(module), attr)
+
+
+def _aca_job(job_id, params):
+    """Run an ACA job, and report its progress on the event queue."""
+    p = dict(ACA_DEFAULTS, **params)
+    alg = ACA((p["width"], p["height"]), p["colors"], p["ants"], p["radius"], p["k1"], p["k2"])
+
+    def callback(i, _):
+        if (i + 1) % p["report"] == 0:
+            _events.put((job_id, {"event": "progress", "iteration": i + 1}))
+            # Checking for cancellation is a round trip to the manager process, so only check
+            # as often as progress is reported.
+            return job_id in _cancelled
+        return False
+
+    alg.run(p["iterations"], period=p["reset_period"], callback=callback)
+    if job_id in _cancelled:
+        return {"event": "cancelled"}
+
+    result = {"event": "result", "iterations": p["iterations"]}
+    if p["return_grid"]:
+        result["grid"] = alg.grid[:, :, 0].tolist()
+    return result
+
+
+def _pso_job(job_id, params):
+    """Run a PSO job, and report its progress on the event queue."""
+    p = dict(PSO_DEFAULTS, **params)
+    if p["objective"] is None:
+        raise ValueError("PSO jobs require an objective of the form 'module:function'")
+    func = resolve(p["objective"])
+    swarm = Swarm(p["particles"], p["ac1"], p["ac2"], p["xmin"], p["xmax"], p["vmin"], p["vmax"])
+
+    def callback(i, s):
+        if i % p["report"] == 0:
+            progress = {"iteration": i, "best": float(s.best), "value": float(s.best_fitness)}
+            _events.put((job_id, dict(progress, event="progress")))
+            return job_id in _cancelled
+        return False
+
+    opt, _, _ = swarm.optimize(func, p["iterations"], callback=callback, verbose=False)
+    if job_id in _cancelled:
+        return {"event": "cancelled"}
+    return {"event": "result", "best": float(opt), "value": float(swarm.best_fitness)}
+
+
+JOBS = {"aca": _aca_job, "pso": _pso_job}
+
+
+def _job(job_id, kind, params):
+    """Run a job in a worker process, and put its final event on the event queue.
+
+    Sending the final event through the same queue as the progress events guarantees that the
+    client sees the events for a job in order.
+    """
+    try:
+        event = JOBS[kind](job_id, params)
+    except Exception as e:  # pylint: disable=broad-except
+        event = {"event": "error", "error": f"{type(e).__name__}: {e}"}
+    _events.put((job_id, event))
+
+
+class JobService:
+    """Accept job specs from clients, and run them on a pool of pre-warmed worker processes."""
+
+    def __init__(self, workers=None):
+        """Start the worker pool.
+
+        :param workers: The number of worker processes. Defaults to the number of CPUs.
+        """
+        self.workers = workers or os.cpu_count()
+        # Don't fork the service process itself. If it has run anything in parallel with numba's
+        # TBB threading layer, the forked children hang.
+        context = multiprocessing.get_context("forkserver")
+        self.manager = context.Manager()
+        self.cancelled = self.manager.dict()
+        self.events = context.Queue()
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_warm,
+            initargs=(self.events, self.cancelled),
+        )
+        # Maps job IDs to the (writer, future) pair of the job's client connection and the job.
+        self.jobs = {}
+
+    def warm(self):
+        """Block until every worker process has started and warmed up."""
+        # The executor spawns workers on demand, so give it enough to do to start all of them.
+        futures = [self.pool.submit(os.getpid) for _ in range(self.workers)]
+        concurrent.futures.wait(futures)
+
+    def emit(self, job_id, event):
+        """Send the given event to the client that submitted the job."""
+        if job_id not in self.jobs:
+            return
+        writer, _ = self.jobs[job_id]
+        if event["event"] in TERMINAL_EVENTS:
+            del self.jobs[job_id]
+            self.cancelled.pop(job_id, None)
+        if not writer.is_closing():
+            writer.write((json.dumps(dict(event, id=job_id)) + "\n").encode())
+
+    def submit(self, writer, message):
+        """Submit the job described by the given message to the worker pool."""
+        job_id, kind = message.get("id"), message.get("kind")
+        if job_id is None or job_id in self.jobs:
+            return {"id": job_id, "event": "error", "error": "Job IDs must be unique"}
+        if kind not in JOBS:
+            return {"id": job_id, "event": "error", "error": f"Unknown job kind {kind!r}"}
+
+        future = self.pool.submit(_job, job_id, kind, message.get("params", {}))
+        self.jobs[job_id] = (writer, future)
+        future.add_done_callback(lambda f: self.__done(job_id, f))
+        return {"id": job_id, "event": "accepted"}
+
+    def cancel(self, job_id):
+        """Cancel the given job, whether it's waiting for a worker or already running."""
+        if job_id not in self.jobs:
+            return
+        _, future = self.jobs[job_id]
+        # Jobs still waiting for a worker can be cancelled outright. Running jobs have to notice
+        # that they've been cancelled themselves.
+        if future.cancel():
+            self.emit(job_id, {"event": "cancelled"})
+        else:
+            self.cancelled[job_id] = True
+
+    def __done(self, job_id, future):
+        """Report jobs that died without reporting their own final event (e.g., a dead worker)."""
+        if not future.cancelled() and future.exception() is not None:
+            error = {"event": "error", "error": repr(future.exception())}
+            self.loop.call_soon_threadsafe(self.emit, job_id, error)
+
+    async def relay(self):
+        """Forward events from the worker processes to the clients."""
+        while True:
+            job_id, event = await self.loop.run_in_executor(None, self.events.get)
+            if job_id is None:
+                break
+            self.emit(job_id, event)
+
+    async def handle(self, reader, writer):
+        """Handle the messages from a single client connection."""
+        async for line in reader:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                reply = {"event": "error", "error": "Malformed message"}
+            else:
+                op = message.get("op")
+                if op == "submit":
+                    reply = self.submit(writer, message)
+                elif op == "cancel":
+                    self.cancel(message.get("id"))
+                    continue
+                else:
+                    reply = {
+                        "id": message.get("id"),
+                        "event": "error",
+                        "error": f"Unknown op {op!r}",
+                    }
+
+            writer.write((json.dumps(reply) + "\n").encode())
+            await writer.drain()
+
+        # Don't leave the client's jobs running after it disconnects.
+        for job_id in [j for j, (w, _) in self.jobs.items() if w is writer]:
+            self.cancel(job_id)
+        writer.close()
+
+    async def serve(self, path=None, host=None, port=None):
+        """Serve clients on a Unix socket at `path`, or on TCP at (`host`, `port`)."""
+        self.loop = asyncio.get_running_loop()
+        self.warm()
+
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path=path)
+        else:
+            server = await asyncio.start_server(self.handle, host=host, port=port)
+
+        relay = asyncio.ensure_future(self.relay())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Wake up the relay so it doesn't leave a thread blocked on the queue.
+            self.events.put((None, None))
+            await relay
+            self.pool.shutdown()
+            self.manager.shutdown()
+
+
+async def submit(kind, params, job_id, path=None, host=None, port=None):
+    """Submit a job to a running service, and yield its events as they arrive.
+
+    :param kind: The kind of job to run, either "aca" or "pso".
+    :param params: A dictionary of job parameters. See ACA_DEFAULTS and PSO_DEFAULTS.
+    :param job_id: A unique ID for the job.
+    :param path: The Unix socket the service listens on.
+    :param host, port: The TCP address the service listens on, if it's not using a Unix socket.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    message = {"op": "submit", "id": job_id, "kind": kind, "params": params}
+    writer.write((json.dumps(message) + "\n").encode())
+    await writer.drain()
+
+    try:
+        async for line in reader:
+            event = json.loads(line)
+            yield event
+            if event["event"] in TERMINAL_EVENTS:
+                break
+    finally:
+        writer.close()
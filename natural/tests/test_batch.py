@@ -0,0 +1,73 @@
+import unittest
+
+import numba
+import numpy as np
+
+from natural.ants import ACA, BatchACA
+
+
+@numba.jit(nopython=True)
+def seed(s):
+    """Seed numba's random state, which the Ant jitclass draws from."""
+    np.random.seed(s)
+
+
+class BatchACATest(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.batch = BatchACA(4, (30, 20), [40, 30], 50, 1, 0.1, 0.15)
+
+    def check_conserved(self, batch):
+        for r in range(batch.replicates):
+            objects = batch.grids[r, :, :, 0]
+            self.assertEqual(np.count_nonzero(objects == 1), 40)
+            self.assertEqual(np.count_nonzero(objects == 2), 30)
+            self.assertEqual(np.count_nonzero(batch.grids[r, :, :, 1]), 50)
+            self.assertTrue(np.all(batch.grids[r, batch.xs[r], batch.ys[r], 1] == 1))
+            self.assertTrue(np.all(batch.loads[r] == 0))
+
+    def test_init(self):
+        self.assertEqual(self.batch.grids.shape, (4, 30, 20, 2))
+        self.assertEqual(self.batch.xs.shape, (4, 50))
+        self.check_conserved(self.batch)
+        # The replicates are independent.
+        self.assertFalse(np.array_equal(self.batch.grids[0], self.batch.grids[1]))
+
+    def test_run(self):
+        self.batch.run(50, period=10)
+        self.check_conserved(self.batch)
+        self.assertEqual(self.batch.quality().shape, (4,))
+
+    def test_parallel(self):
+        serial = BatchACA(0, (30, 20), [40, 30], 50, 1, 0.1, 0.15, parallel=False)
+        serial.grids = self.batch.grids.copy()
+        serial.xs, serial.ys = self.batch.xs.copy(), self.batch.ys.copy()
+        serial.loads = self.batch.loads.copy()
+
+        self.batch.run(30, seeds=[1, 2, 3, 4])
+        serial.run(30, seeds=[1, 2, 3, 4])
+        np.testing.assert_array_equal(self.batch.grids, serial.grids)
+        np.testing.assert_array_equal(self.batch.xs, serial.xs)
+
+    def test_same_as_aca(self):
+        np.random.seed(1)
+        aca = ACA((30, 20), [40, 30], 50, 1, 0.1, 0.15)
+        np.random.seed(1)
+        batch = BatchACA(1, (30, 20), [40, 30], 50, 1, 0.1, 0.15)
+        np.testing.assert_array_equal(batch.grids[0], aca.grid)
+
+        stacked = BatchACA.stack([aca, aca])
+        np.testing.assert_array_equal(stacked.grids[1], aca.grid)
+
+        seed(7)
+        aca.run(40, period=15)
+        stacked.run(40, period=15, seeds=[7, 7])
+        for r in range(2):
+            np.testing.assert_array_equal(stacked.grids[r], aca.grid)
+            self.assertEqual(list(stacked.xs[r]), [ant.x for ant in aca.ants])
+            self.assertEqual(list(stacked.ys[r]), [ant.y for ant in aca.ants])
+
+    def test_stack_mismatch(self):
+        acas = [ACA((10, 10), [5, 5], 5, 1, 0.1, 0.1), ACA((10, 10), [5, 5], 5, 2, 0.1, 0.1)]
+        with self.assertRaises(AssertionError):
+            BatchACA.stack(acas)
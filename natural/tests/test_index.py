@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from natural.ants import ACA, ObjectIndex
+
+
+class ObjectIndexTest(unittest.TestCase):
+    def setUp(self):
+        objects = np.zeros((10, 10), dtype=int)
+        objects[0, 0] = 1
+        objects[8, 8] = 2
+        self.index = ObjectIndex(objects, 1)
+
+    def test_counts(self):
+        self.assertEqual(self.index.counts.shape, (4, 4))
+        self.assertEqual(self.index.counts.sum(), 2)
+        self.assertEqual(self.index.counts[0, 0], 1)
+        self.assertEqual(self.index.counts[2, 2], 1)
+
+    def test_near(self):
+        xs = np.array([1, 2, 4, 9, 4, 5])
+        ys = np.array([1, 2, 4, 9, 0, 5])
+        # (5, 5) can't see (8, 8), but their buckets overlap, so the check is conservative.
+        near = [True, True, False, True, False, True]
+        self.assertEqual(list(self.index.near(xs, ys)), near)
+
+    def test_add(self):
+        self.index.add(0, 0, -1)
+        self.assertFalse(self.index.near(np.array([1]), np.array([1]))[0])
+        self.index.add(5, 5)
+        self.assertTrue(self.index.near(np.array([4]), np.array([4]))[0])
+
+    def test_sample(self):
+        xs, ys = self.index.sample(100)
+        buckets = set(zip(xs // 3, ys // 3))
+        self.assertLessEqual(buckets, {(0, 0), (2, 2)})
+        self.assertTrue(np.all((xs < 10) & (ys < 10)))
+
+
+class ActiveACATest(unittest.TestCase):
+    def check_conserved(self, aca):
+        self.assertEqual(np.count_nonzero(aca.grid[:, :, 0] == 1), 30)
+        self.assertEqual(np.count_nonzero(aca.grid[:, :, 0] == 2), 30)
+        self.assertEqual(np.count_nonzero(aca.grid[:, :, 1]), 40)
+        for ant in aca.ants:
+            self.assertEqual(aca.grid[ant.x, ant.y, 1], 1)
+        self.assertEqual(aca.index.counts.sum(), 60)
+
+    def test_active(self):
+        np.random.seed(0)
+        aca = ACA((30, 30), [30, 30], 40, 1, 0.1, 0.1, active=True)
+        aca.run(50, period=20)
+        self.check_conserved(aca)
+
+    def test_relocate(self):
+        np.random.seed(0)
+        aca = ACA((30, 30), [30, 30], 40, 1, 0.1, 0.1, active=True, relocate=True)
+        aca.run(50, period=20)
+        self.check_conserved(aca)
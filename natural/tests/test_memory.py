@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from natural.ants import Ant
+
+
+class MemoryTest(unittest.TestCase):
+    def setUp(self):
+        self.ant = Ant(5, 5, 0.1, 0.1)
+        self.ant.init_memory(2, 3, 1.0)
+
+    def test_no_memory(self):
+        ant = Ant(5, 5, 0.1, 0.1)
+        ant.remember(1)
+        self.assertEqual(ant.memory.shape, (0, 0, 2))
+
+    def test_remember(self):
+        self.ant.remember(2)
+        self.assertEqual(list(self.ant.memory_len), [0, 1])
+        self.assertEqual(list(self.ant.memory[1, 0]), [5, 5])
+
+    def test_ring_buffer(self):
+        for x in range(5):
+            self.ant.x = x
+            self.ant.remember(1)
+
+        # Only the three most recent locations are remembered, oldest overwritten first.
+        self.assertEqual(self.ant.memory_len[0], 3)
+        self.assertEqual(sorted(self.ant.memory[0, :, 0]), [2, 3, 4])
+
+    def test_dropoff(self):
+        # Surrounded by like objects, the ant always drops its load.
+        kernel = np.zeros((3, 3, 2), dtype=np.int64)
+        kernel[:, :, 0] = 1
+        kernel[1, 1, 0] = 0
+        kernel[1, 1, 1] = 1
+        self.ant.load = 1
+
+        self.ant.update_load(kernel, 1, 1)
+        self.assertEqual(self.ant.load, 0)
+        self.assertEqual(self.ant.memory_len[0], 1)
+        self.assertEqual(list(self.ant.memory[0, 0]), [5, 5])
+
+    def test_towards_memory(self):
+        self.ant.x, self.ant.y = 0, 0
+        self.ant.remember(1)
+        self.ant.x, self.ant.y = 5, 5
+        self.ant.load = 1
+
+        # With a bias of 1, the ant always heads towards the remembered location.
+        kernel = np.zeros((3, 3, 2), dtype=np.int64)
+        kernel[1, 1, 1] = 1
+        self.ant.update_location(kernel, 1, 1)
+        self.assertEqual((self.ant.x, self.ant.y), (4, 4))
+        self.assertEqual(kernel[0, 0, 1], 1)
+        self.assertEqual(kernel[1, 1, 1], 0)
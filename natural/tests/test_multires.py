@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+
+from natural.ants import ACA, cluster_quality, coarsen, refine, run_multiresolution
+
+
+class CoarsenTest(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.objects = np.zeros((10, 10), dtype=int)
+        self.objects[0, 0] = 1
+        self.objects[1, 1] = 2
+        self.objects[9, 9] = 1
+
+    def test_shape(self):
+        self.assertEqual(coarsen(self.objects, 2).shape, (5, 5))
+        self.assertEqual(coarsen(self.objects, 3).shape, (4, 4))
+
+    def test_conserved(self):
+        coarse = coarsen(self.objects, 2)
+        self.assertEqual(np.sum(coarse == 1), 2)
+        self.assertEqual(np.sum(coarse == 2), 1)
+        self.assertEqual(coarse[4, 4], 1)
+        # The two objects in the first block contest the same coarse cell.
+        self.assertIn(coarse[0, 0], (1, 2))
+
+    def test_full(self):
+        objects = np.ones((4, 4), dtype=int)
+        with self.assertRaises(AssertionError):
+            coarsen(objects, 2)
+
+
+class RefineTest(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.coarse = np.zeros((5, 5), dtype=int)
+        self.coarse[0, 0] = self.coarse[0, 1] = self.coarse[1, 0] = self.coarse[1, 1] = 1
+        self.coarse[4, 4] = 2
+
+    def test_projected(self):
+        fine = refine(self.coarse, (20, 20), 4)
+        self.assertEqual(np.sum(fine == 1), 4)
+        self.assertEqual(np.sum(fine == 2), 1)
+        # Every object stays in its own block, rather than being packed with its neighbors.
+        for x, y in zip(*np.nonzero(fine)):
+            self.assertEqual(fine[x, y], self.coarse[x // 4, y // 4])
+        self.assertEqual(np.count_nonzero(coarsen(fine, 4)), 5)
+
+    def test_partial_blocks(self):
+        # The last row and column of blocks are only two cells wide on a 18x18 grid.
+        for _ in range(20):
+            fine = refine(self.coarse, (18, 18), 4)
+            xs, ys = np.nonzero(fine == 2)
+            self.assertTrue(16 <= xs[0] < 18 and 16 <= ys[0] < 18)
+            self.assertEqual(np.count_nonzero(fine), 5)
+
+    def test_not_clustered(self):
+        # Projecting a coarsened grid doesn't cluster it.
+        objects = np.zeros((120, 120), dtype=int)
+        cells = np.random.choice(objects.size, 600, replace=False)
+        objects.flat[cells[:300]] = 1
+        objects.flat[cells[300:]] = 2
+        fine = refine(coarsen(objects, 2), objects.shape, 2)
+
+        self.assertEqual(np.sum(fine == 1), 300)
+        self.assertEqual(np.sum(fine == 2), 300)
+        self.assertLess(cluster_quality(fine), cluster_quality(objects) + 0.05)
+
+
+class RunMultiresolutionTest(unittest.TestCase):
+    def test_conserved(self):
+        np.random.seed(0)
+        aca = ACA((40, 40), [60, 60], 50, 1, 0.1, 0.1)
+        projected = run_multiresolution(aca, 20, levels=2, block=2, fine_iters=5)
+
+        self.assertEqual(projected.shape, (40, 40))
+        self.assertEqual(np.sum(projected == 1), 60)
+        self.assertEqual(np.sum(aca.grid[:, :, 0] == 1), 60)
+        self.assertEqual(np.sum(aca.grid[:, :, 0] == 2), 60)
+
+
+class FromObjectsTest(unittest.TestCase):
+    def test_conserved(self):
+        np.random.seed(0)
+        objects = np.zeros((20, 20), dtype=int)
+        objects[:5, :5] = 1
+        objects[10:, 10:] = 2
+
+        aca = ACA.from_objects(objects, 20, 1, 0.1, 0.1)
+        self.assertEqual(aca.colors, [25, 100])
+        self.assertTrue(np.all(aca.grid[:, :, 0] == objects))
+
+        # Running the ACA moves the objects around, but never loses any.
+        aca.run(20, period=5)
+        self.assertEqual(np.sum(aca.grid[:, :, 0] == 1), 25)
+        self.assertEqual(np.sum(aca.grid[:, :, 0] == 2), 100)
@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from natural.ants import ACA, Ant, Ant32, seed
+from natural.ants.ant import ant_class
+
+
+def is_single(value):
+    """Whether the given value is exactly representable in single precision."""
+    return float(np.float32(value)) == value
+
+
+class Ant32Test(unittest.TestCase):
+    def setUp(self):
+        self.kernel = np.zeros((5, 5), dtype=int)
+        self.kernel[0, 0] = 1
+
+    def test_probabilities(self):
+        ant32 = Ant32(5, 5, 0.1, 0.1)
+        f = ant32.perceived_fraction(self.kernel, 1)
+        self.assertTrue(is_single(f))
+        self.assertAlmostEqual(f, 1 / 24, places=6)
+
+        # Inside the ant, f is single precision, so the probabilities are too.
+        pickup = ant32.pickup_probability(np.float32(f))
+        dropoff = ant32.dropoff_probability(np.float32(f))
+        self.assertTrue(is_single(pickup))
+        self.assertTrue(is_single(dropoff))
+        self.assertAlmostEqual(pickup, (0.1 / (0.1 + 1 / 24)) ** 2, places=6)
+        self.assertAlmostEqual(dropoff, 2 / 24, places=6)
+
+    def test_double(self):
+        ant64 = Ant(5, 5, 0.1, 0.1)
+        f = ant64.perceived_fraction(self.kernel, 1)
+        self.assertFalse(is_single(f))
+        self.assertEqual(f, 1 / 24)
+
+    def test_ant_class(self):
+        ant32 = ant_class(np.float32)(5, 5, 0.1, 0.1)
+        self.assertTrue(is_single(ant32.perceived_fraction(self.kernel, 1)))
+
+
+class ACA32Test(unittest.TestCase):
+    def setUp(self):
+        seed(0)
+        self.aca = ACA((30, 20), [40, 30], 50, 1, 0.1, 0.15, dtype=np.float32)
+
+    def test_ants(self):
+        # 1 / 24 isn't exactly representable in either precision, so it tells them apart.
+        kernel = np.zeros((5, 5), dtype=int)
+        kernel[0, 0] = 1
+        for a in self.aca.ants:
+            self.assertTrue(is_single(a.perceived_fraction(kernel, 1)))
+
+    def test_run(self):
+        before = self.aca.grid[:, :, 0].copy()
+        self.aca.run(50, period=10)
+        # The ants actually moved objects around.
+        self.assertFalse(np.array_equal(self.aca.grid[:, :, 0], before))
+
+        objects = self.aca.grid[:, :, 0]
+        self.assertEqual(np.count_nonzero(objects == 1), 40)
+        self.assertEqual(np.count_nonzero(objects == 2), 30)
+        self.assertEqual(np.count_nonzero(self.aca.grid[:, :, 1]), 50)
+        self.assertTrue(all(a.load == 0 for a in self.aca.ants))
+
+    def test_unsupported(self):
+        with self.assertRaises(AssertionError):
+            ACA((30, 20), [40, 30], 50, 1, 0.1, 0.15, dtype=np.float16)
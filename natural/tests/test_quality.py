@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from natural.ants import cluster_quality
+
+
+class ClusterQualityTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(cluster_quality(np.zeros((5, 5), dtype=int)), 0)
+
+    def test_isolated(self):
+        objects = np.zeros((5, 5), dtype=int)
+        objects[0, 0] = 1
+        objects[2, 2] = 1
+        objects[4, 4] = 2
+        self.assertEqual(cluster_quality(objects), 0)
+
+    def test_mixed(self):
+        # Neighbors of a different color don't count.
+        objects = np.zeros((5, 5), dtype=int)
+        objects[2, 2] = 1
+        objects[2, 3] = 2
+        self.assertEqual(cluster_quality(objects), 0)
+
+    def test_block(self):
+        # In a 3x3 block, the center has 8 like neighbors, the edges 5, and the corners 3.
+        objects = np.zeros((5, 5), dtype=int)
+        objects[1:4, 1:4] = 1
+        self.assertAlmostEqual(cluster_quality(objects), (8 + 4 * 5 + 4 * 3) / (9 * 8))
+
+    def test_full(self):
+        self.assertEqual(
+            cluster_quality(np.ones((5, 5), dtype=int)), (9 * 8 + 12 * 5 + 4 * 3) / (25 * 8)
+        )
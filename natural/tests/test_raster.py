@@ -0,0 +1,93 @@
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+
+import numpy as np
+
+from natural import raster
+
+
+class RasterTest(unittest.TestCase):
+    def setUp(self):
+        self.objects = np.zeros((5, 4), dtype=int)
+        self.objects[0, 0] = 1
+        self.objects[0, 1] = 1
+        self.objects[1, 0] = 2
+        self.objects[4, 3] = 2
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_render(self):
+        image = raster.render(self.objects)
+        self.assertEqual(image.shape, (5, 4, 3))
+        self.assertEqual(image.dtype, np.uint8)
+        self.assertEqual(list(image[0, 0]), [255, 0, 0])
+        self.assertEqual(list(image[1, 0]), [0, 0, 255])
+        self.assertEqual(list(image[2, 2]), [255, 255, 255])
+
+    def test_render_too_many_colors(self):
+        self.objects[2, 2] = len(raster.PALETTE)
+        self.objects[3, 3] = len(raster.PALETTE) + 1
+        image = raster.render(self.objects)
+        self.assertEqual(list(image[2, 2]), list(raster.PALETTE[-1]))
+        self.assertEqual(list(image[3, 3]), list(raster.PALETTE[-1]))
+        self.assertEqual(list(image[0, 0]), [255, 0, 0])
+
+    def test_downsample(self):
+        small = raster.downsample(self.objects, (3, 2))
+        self.assertEqual(small.shape, (3, 2))
+        # The top left block has two reds and a blue.
+        self.assertEqual(small[0, 0], 1)
+        # A lone object isn't lost in an otherwise empty block.
+        self.assertEqual(small[2, 1], 2)
+        self.assertEqual(np.count_nonzero(small), 2)
+
+    def test_downsample_fits(self):
+        self.assertIs(raster.downsample(self.objects, (5, 4)), self.objects)
+
+    def test_png(self):
+        image = raster.render(self.objects)
+        path = os.path.join(self.directory.name, "grid.png")
+        raster.save(path, image)
+
+        with open(path, "rb") as f:
+            data = f.read()
+        self.assertEqual(data[:8], b"\x89PNG\r\n\x1a\n")
+        columns, rows = struct.unpack(">II", data[16:24])
+        self.assertEqual((rows, columns), (5, 4))
+
+        length = struct.unpack(">I", data[33:37])[0]
+        raw = np.frombuffer(zlib.decompress(data[41 : 41 + length]), dtype=np.uint8)
+        raw = raw.reshape(rows, -1)
+        self.assertTrue(np.all(raw[:, 0] == 0))
+        np.testing.assert_array_equal(raw[:, 1:].reshape(image.shape), image)
+
+    def test_ppm(self):
+        image = raster.render(self.objects)
+        path = os.path.join(self.directory.name, "grid.ppm")
+        raster.save(path, image)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.readline(), b"P6\n")
+            self.assertEqual(f.readline(), b"4 5\n")
+            self.assertEqual(f.readline(), b"255\n")
+            pixels = np.frombuffer(f.read(), dtype=np.uint8)
+        np.testing.assert_array_equal(pixels.reshape(image.shape), image)
+
+    def test_unsupported(self):
+        with self.assertRaises(ValueError):
+            raster.save(os.path.join(self.directory.name, "grid.eps"), raster.render(self.objects))
+
+    def test_recorder(self):
+        pattern = os.path.join(self.directory.name, "frames", "{:03d}.ppm")
+        recorder = raster.Recorder(pattern, lambda objects: raster.render(objects), period=2)
+        for i in range(5):
+            self.assertFalse(recorder(i, self.objects))
+        self.assertEqual(
+            [os.path.basename(f) for f in recorder.frames], ["000.ppm", "002.ppm", "004.ppm"]
+        )
+        self.assertTrue(all(os.path.exists(f) for f in recorder.frames))
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from natural.service import TERMINAL_EVENTS, JobService, submit
+
+# A job that runs far longer than any test waits for, unless it's cancelled.
+LONG_JOB = {"width": 50, "height": 50, "iterations": 1000000, "report": 5}
+
+
+async def collect(kind, params, job_id, path):
+    """Submit a job, and collect all of its events."""
+    return [event async for event in submit(kind, params, job_id, path=path)]
+
+
+class Connection:
+    """A raw client connection, for sending more than one message."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, path):
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def send(self, message):
+        self.writer.write((json.dumps(message) + "\n").encode())
+        await self.writer.drain()
+
+    async def receive(self, timeout=60):
+        return json.loads(await asyncio.wait_for(self.reader.readline(), timeout))
+
+    async def until(self, job_id, event):
+        """Receive events until the given job sends the given event, and return them all."""
+        events = []
+        while not events or events[-1]["id"] != job_id or events[-1]["event"] != event:
+            events.append(await self.receive())
+        return events
+
+    def close(self):
+        self.writer.close()
+
+
+class JobServiceTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "service.sock")
+        cls.service = JobService(workers=1)
+        cls.loop = asyncio.new_event_loop()
+        cls.task = cls.loop.create_task(cls.service.serve(path=cls.path))
+        cls.thread = threading.Thread(target=cls.serve)
+        cls.thread.start()
+
+        # serve() warms the worker up before it starts listening on the socket.
+        while not os.path.exists(cls.path) and cls.thread.is_alive():
+            cls.thread.join(0.1)
+
+    @classmethod
+    def serve(cls):
+        try:
+            cls.loop.run_until_complete(cls.task)
+        except asyncio.CancelledError:
+            pass
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.task.cancel)
+        cls.thread.join()
+        cls.loop.close()
+        cls.directory.cleanup()
+
+    def run_client(self, coro):
+        return asyncio.run(asyncio.wait_for(coro, 120))
+
+    def test_aca(self):
+        params = {"width": 20, "height": 20, "colors": [10, 10], "ants": 20}
+        params.update({"iterations": 20, "report": 5})
+        events = self.run_client(collect("aca", params, "aca", self.path))
+
+        kinds = [event["event"] for event in events]
+        self.assertEqual(kinds, ["accepted"] + ["progress"] * 4 + ["result"])
+        self.assertEqual([event["iteration"] for event in events[1:-1]], [5, 10, 15, 20])
+        self.assertEqual(events[-1]["iterations"], 20)
+        self.assertTrue(all(event["id"] == "aca" for event in events))
+
+    def test_pso_without_objective(self):
+        events = self.run_client(collect("pso", {}, "pso", self.path))
+
+        self.assertEqual([event["event"] for event in events], ["accepted", "error"])
+        self.assertIn("objective", events[-1]["error"])
+
+    def test_duplicate_id(self):
+        async def client():
+            connection = await Connection.open(self.path)
+            await connection.send({"op": "submit", "id": "dup", "kind": "aca", "params": LONG_JOB})
+            first = await connection.receive()
+            await connection.send({"op": "submit", "id": "dup", "kind": "aca", "params": LONG_JOB})
+            events = await connection.until("dup", "error")
+
+            # Clean up the first job, so it doesn't hog the only worker.
+            await connection.send({"op": "cancel", "id": "dup"})
+            await connection.until("dup", "cancelled")
+            connection.close()
+            return first, events[-1]
+
+        first, duplicate = self.run_client(client())
+        self.assertEqual(first["event"], "accepted")
+        self.assertIn("unique", duplicate["error"])
+
+    def test_cancel_running(self):
+        async def client():
+            connection = await Connection.open(self.path)
+            await connection.send({"op": "submit", "id": "long", "kind": "aca", "params": LONG_JOB})
+            # Wait for the job to be running before cancelling it.
+            events = await connection.until("long", "progress")
+            await connection.send({"op": "cancel", "id": "long"})
+            events += await connection.until("long", "cancelled")
+
+            # Nothing else is sent for the job after its terminal event.
+            try:
+                events.append(await connection.receive(timeout=2))
+            except asyncio.TimeoutError:
+                pass
+            connection.close()
+            return events
+
+        events = self.run_client(client())
+        kinds = [event["event"] for event in events]
+        self.assertEqual(kinds[0], "accepted")
+        self.assertEqual(kinds[-1], "cancelled")
+        self.assertEqual(sum(kind in TERMINAL_EVENTS for kind in kinds), 1)
+        self.assertEqual(set(kinds[1:-1]), {"progress"})
+        self.assertLess(events[-2]["iteration"], LONG_JOB["iterations"])
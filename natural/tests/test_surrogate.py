@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+from natural.particles import Surrogate
+
+
+class SurrogateTest(unittest.TestCase):
+    def setUp(self):
+        self.surrogate = Surrogate(budget=0.25, neighbors=2)
+        self.x = np.linspace(0, 1, 11)
+        self.surrogate.evaluate(np.sin, self.x)
+
+    def test_evaluate(self):
+        self.assertEqual(self.surrogate.evaluations, 11)
+        self.assertAlmostEqual(self.surrogate.evaluate(np.sin, 0.5), np.sin(0.5))
+        self.assertEqual(self.surrogate.evaluations, 12)
+
+    def test_exact(self):
+        # Archived positions are predicted exactly.
+        self.assertTrue(np.allclose(self.surrogate.predict(self.x), np.sin(self.x)))
+
+    def test_interpolate(self):
+        # Halfway between two archived positions is the average of their fitness.
+        prediction = self.surrogate.predict(np.array([0.05]))
+        self.assertAlmostEqual(prediction[0], (np.sin(0) + np.sin(0.1)) / 2)
+
+    def test_screen(self):
+        particles = np.array([0.01, 0.99, 0.52, 0.3])
+        mask = self.surrogate.screen(particles)
+        # Only the most promising quarter of the particles are evaluated.
+        self.assertEqual(list(mask), [False, True, False, False])
+        self.assertEqual(self.surrogate.saved, 3)
+
+    def test_screen_empty(self):
+        # Everything is evaluated until there's enough data to predict from.
+        surrogate = Surrogate(budget=0.25, neighbors=2)
+        self.assertTrue(np.all(surrogate.screen(self.x)))
+        self.assertEqual(surrogate.saved, 0)
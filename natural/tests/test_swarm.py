@@ -0,0 +1,133 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from natural.particles import Surrogate, Swarm
+
+
+def func(x):
+    return np.sin(x)
+
+
+class SwarmPrecisionTest(unittest.TestCase):
+    def test_single(self):
+        swarm = Swarm(10, 2.05, 2.05, 0, 3, -0.1, 0.1, dtype=np.float32)
+        _, bests, means = swarm.optimize(func, iters=10, verbose=False)
+
+        for array in (swarm.particles, swarm.velocities, swarm.history, bests, means):
+            self.assertEqual(array.dtype, np.float32)
+        self.assertIsInstance(swarm.best, np.float32)
+
+    def test_double(self):
+        swarm = Swarm(10, 2.05, 2.05, 0, 3, -0.1, 0.1)
+        opt, _, _ = swarm.optimize(func, iters=50, verbose=False)
+
+        self.assertEqual(swarm.particles.dtype, np.float64)
+        self.assertAlmostEqual(opt, np.pi / 2, places=2)
+
+
+class SwarmSurrogateTest(unittest.TestCase):
+    def setUp(self):
+        self.evaluations = 0
+
+    def counted(self, x):
+        self.evaluations += np.size(x)
+        return func(x)
+
+    def test_budget(self):
+        np.random.seed(0)
+        surrogate = Surrogate(budget=0.25, neighbors=4)
+        swarm = Swarm(20, 2.05, 2.05, 0, 3, -0.1, 0.1, surrogate=surrogate)
+        opt, bests, _ = swarm.optimize(self.counted, iters=50, verbose=False)
+
+        # The whole swarm is evaluated to start with, and then a quarter of it each iteration.
+        self.assertEqual(self.evaluations, 20 + 49 * 5)
+        self.assertEqual(surrogate.evaluations, self.evaluations)
+        self.assertEqual(surrogate.evaluations + surrogate.saved, 20 * 50)
+        self.assertEqual(len(bests), 50)
+        self.assertAlmostEqual(opt, np.pi / 2, places=2)
+
+    def test_cached_fitness(self):
+        np.random.seed(0)
+        swarm = Swarm(20, 2.05, 2.05, 0, 3, -0.1, 0.1, surrogate=Surrogate(budget=0.5))
+        opt, _, _ = swarm.optimize(self.counted, iters=20, verbose=False)
+
+        # The cached fitness matches the historical best positions, which screening never makes
+        # worse.
+        np.testing.assert_array_equal(swarm.history_fitness, func(swarm.history))
+        self.assertEqual(swarm.best_fitness, func(opt))
+        self.assertEqual(swarm.best_fitness, swarm.history_fitness.max())
+
+    def test_dimensions(self):
+        np.random.seed(0)
+        surrogate = Surrogate(budget=0.5)
+        swarm = Swarm(20, 2.05, 2.05, [-3, -3], [3, 3], -0.5, 0.5, surrogate=surrogate)
+        opt, _, _ = swarm.optimize(paraboloid, iters=100, verbose=False)
+
+        self.assertEqual(surrogate.evaluations + surrogate.saved, 20 * 100)
+        np.testing.assert_allclose(opt, [1, -2], atol=5e-2)
+        self.assertEqual(swarm.best_fitness, paraboloid(opt))
+
+
+class SwarmAsyncTest(unittest.TestCase):
+    def test_budget(self):
+        evaluations = []
+
+        def counted(x):
+            evaluations.append(x)
+            return func(x)
+
+        swarm = Swarm(10, 2.05, 2.05, 0, 3, -0.1, 0.1)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            opt, bests, means = swarm.optimize_async(counted, 505, executor, verbose=False)
+
+        self.assertEqual(len(evaluations), 505)
+        # The history is sampled once per swarm's worth of evaluations.
+        self.assertEqual(len(bests), 50)
+        self.assertEqual(len(means), 50)
+        self.assertAlmostEqual(opt, np.pi / 2, places=2)
+        self.assertEqual(swarm.best_fitness, max(func(x) for x in evaluations))
+
+
+def paraboloid(x):
+    """A concave function with its maximum at (1, -2), for one position or a (n, 2) array."""
+    x = np.asarray(x)
+    return -((x[..., 0] - 1) ** 2) - (x[..., 1] + 2) ** 2
+
+
+class SwarmDimensionsTest(unittest.TestCase):
+    def test_shape(self):
+        swarm = Swarm(10, 2.05, 2.05, [0, -5, 0], [3, 5, 1], -0.1, 0.1)
+        self.assertEqual(swarm.shape, (3,))
+        self.assertEqual(swarm.particles.shape, (10, 3))
+        self.assertEqual(swarm.velocities.shape, (10, 3))
+
+    def test_optimize(self):
+        np.random.seed(0)
+        swarm = Swarm(20, 2.05, 2.05, [-3, -3], [3, 3], [-0.5, -0.5], [0.5, 0.5])
+        opt, bests, means = swarm.optimize(paraboloid, iters=100, verbose=False)
+
+        self.assertEqual(bests.shape, (100, 2))
+        self.assertEqual(means.shape, (100, 2))
+        np.testing.assert_allclose(opt, [1, -2], atol=1e-2)
+        # The best position is a copy, not a view of a particle that kept moving.
+        self.assertEqual(swarm.best_fitness, paraboloid(opt))
+
+    def test_bounds(self):
+        np.random.seed(0)
+        swarm = Swarm(20, 2.05, 2.05, [2, 0], [3, 1], -1, 1)
+        opt, _, _ = swarm.optimize(paraboloid, iters=20, verbose=False)
+
+        self.assertTrue(np.all(swarm.particles >= [2, 0]))
+        self.assertTrue(np.all(swarm.particles <= [3, 1]))
+        np.testing.assert_allclose(opt, [2, 0], atol=1e-2)
+
+    def test_async(self):
+        np.random.seed(0)
+        swarm = Swarm(10, 2.05, 2.05, [-3, -3], [3, 3], -0.5, 0.5)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            opt, bests, _ = swarm.optimize_async(paraboloid, 500, executor, verbose=False)
+
+        self.assertEqual(bests.shape, (50, 2))
+        self.assertEqual(swarm.best_fitness, paraboloid(opt))
@@ -0,0 +1,117 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from natural import tuning
+from natural.particles import Swarm
+
+
+class DecodeTest(unittest.TestCase):
+    def test_round(self):
+        point = tuning.decode([0.123, 0.5, 2.4, 77])
+        self.assertEqual(point, (("k1", 0.12), ("k2", 0.5), ("radius", 2), ("ants", 80)))
+        self.assertIsInstance(dict(point)["radius"], int)
+
+    def test_clamp(self):
+        point = dict(tuning.decode([-1, 1, 0, 5000]))
+        self.assertEqual(point, {"k1": 0.01, "k2": 0.5, "radius": 1, "ants": 1000})
+
+    def test_equal_keys(self):
+        # Positions that round to the same grid point make the same key, float error and all.
+        self.assertEqual(tuning.decode([0.1 + 0.2, 0.3, 1, 50]), tuning.decode([0.3, 0.3, 1, 50]))
+
+
+class FitTest(unittest.TestCase):
+    def test_clamp(self):
+        problem = dict(tuning.PROBLEM, width=30, height=30)
+        space = tuning.fit(problem)
+        self.assertEqual(space["ants"], (50, 900, 10))
+        self.assertEqual(space["k1"], tuning.SPACE["k1"])
+        # The default bounds are left alone.
+        self.assertEqual(tuning.SPACE["ants"], (50, 1000, 10))
+        self.assertEqual(tuning.fit(), tuning.SPACE)
+
+    def test_too_many_objects(self):
+        with self.assertRaises(ValueError):
+            tuning.fit(dict(tuning.PROBLEM, width=10, height=10))
+
+    def test_too_many_ants(self):
+        with self.assertRaises(ValueError):
+            tuning.fit(dict(tuning.PROBLEM, width=7, height=7, colors=[10, 10]))
+
+
+class CachedExecutorTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def func(self, point, seed):
+        with self.lock:
+            self.calls.append((point, seed))
+        return point + seed
+
+    def test_replicates(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            executor = tuning.CachedExecutor(pool, round, replicates=3)
+            future = executor.submit(self.func, 1.2)
+            # The mean of 1 + 0, 1 + 1, and 1 + 2.
+            self.assertEqual(future.result(), 2)
+        self.assertEqual(sorted(self.calls), [(1, 0), (1, 1), (1, 2)])
+
+    def test_cache(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            executor = tuning.CachedExecutor(pool, round, replicates=2)
+            futures = [executor.submit(self.func, x) for x in (1.2, 0.9, 2.1, 1.4)]
+            results = [f.result() for f in futures]
+
+        self.assertEqual(results, [1.5, 1.5, 2.5, 1.5])
+        # Every submission gets its own future, even when the point is shared.
+        self.assertEqual(len(set(futures)), 4)
+        self.assertEqual(executor.hits, 2)
+        self.assertEqual(executor.simulations, 4)
+        self.assertEqual(len(self.calls), 4)
+        self.assertEqual(executor.results(), [(2, 2.5), (1, 1.5)])
+
+    def test_swarm(self):
+        def func(point, seed):
+            return -((point[0] - 3) ** 2) - (point[1] + 1) ** 2
+
+        def key(x):
+            return tuple(int(v) for v in np.round(x))
+
+        np.random.seed(0)
+        swarm = Swarm(8, 2.05, 2.05, [-5, -5], [5, 5], -1, 1)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            executor = tuning.CachedExecutor(pool, key)
+            opt, _, _ = swarm.optimize_async(func, 200, executor, verbose=False)
+
+        self.assertEqual(key(opt), (3, -1))
+        # Most of the evaluations revisit points on the 11x11 grid.
+        self.assertLessEqual(executor.simulations, 121)
+        self.assertEqual(executor.simulations + executor.hits, 200)
+
+
+class SimulateTest(unittest.TestCase):
+    def test_simulate(self):
+        problem = {"width": 20, "height": 20, "colors": [10, 10], "iterations": 5}
+        point = tuning.decode([0.1, 0.1, 1, 50])
+        quality = tuning.simulate(point, 0, problem)
+        self.assertGreaterEqual(quality, 0)
+        self.assertLessEqual(quality, 1)
+        # The same seed gives the same simulation.
+        self.assertEqual(tuning.simulate(point, 0, problem), quality)
+
+
+class TuneTest(unittest.TestCase):
+    def test_small_grid(self):
+        # The default bounds allow up to 1000 ants, far more than fit in this grid.
+        problem = {"width": 10, "height": 10, "colors": [10, 10], "iterations": 5}
+        np.random.seed(0)
+        best, quality, executor = tuning.tune(
+            problem, particles=4, evaluations=8, replicates=1, workers=1, verbose=False
+        )
+        self.assertLessEqual(best["ants"], 100)
+        self.assertTrue(all(dict(point)["ants"] <= 100 for point, _ in executor.results()))
+        self.assertEqual(quality, max(score for _, score in executor.results()))
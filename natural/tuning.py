@@ -0,0 +1,223 @@
+"""Tune the ACA parameters with a particle swarm, instead of sweeping them by hand.
+
+Each particle is a point in the (k1, k2, radius, ants) parameter space. Evaluating a point runs a
+few short ACA simulations in worker processes, and scores them with cluster_quality(). Simulations
+are expensive, so the parameters are rounded to a grid, and every point on the grid is simulated
+at most once. Particles that land on an already simulated point reuse its score for free.
+"""
+
+import concurrent.futures
+import functools
+import multiprocessing
+import threading
+
+import numpy as np
+
+from .ants import ACA
+from .ants import seed as _seed
+from .particles import Swarm
+
+# The (low, high, step) bounds of each parameter. Parameters with an integer step are integers.
+SPACE = {
+    "k1": (0.01, 0.5, 0.01),
+    "k2": (0.01, 0.5, 0.01),
+    "radius": (1, 3, 1),
+    "ants": (50, 1000, 10),
+}
+
+# The clustering problem to tune the parameters for. The defaults are a shortened prob1.py run.
+PROBLEM = {
+    "width": 200,
+    "height": 200,
+    "colors": [100, 100],
+    "iterations": 200,
+}
+
+
+def decode(x, space=SPACE):
+    """Round a particle's position to the nearest point on the parameter grid.
+
+    :param x: A position in the parameter space, with one dimension per parameter.
+    :param space: The parameter bounds. See SPACE.
+    :returns: A tuple of (name, value) pairs, usable as a dictionary key.
+    """
+    params = []
+    for value, (name, (low, high, step)) in zip(x, space.items()):
+        value = min(high, max(low, low + round((value - low) / step) * step))
+        # Round off the float error, so that equal grid points make equal keys.
+        value = int(value) if isinstance(step, int) else round(value, 10)
+        params.append((name, value))
+    return tuple(params)
+
+
+def fit(problem=PROBLEM, space=SPACE):
+    """Narrow the parameter bounds to the ones the given problem can actually simulate.
+
+    :param problem: The clustering problem to tune for. See PROBLEM.
+    :param space: The parameter bounds. See SPACE.
+    :returns: A copy of the bounds, with at most one ant per grid cell.
+    :raises ValueError: If the problem can't be simulated with any parameters in the bounds.
+    """
+    cells = problem["width"] * problem["height"]
+    if sum(problem["colors"]) > cells:
+        raise ValueError(f"{sum(problem['colors'])} objects don't fit in a {cells} cell grid")
+
+    low, high, step = space["ants"]
+    if low > cells:
+        raise ValueError(f"The minimum of {low} ants doesn't fit in a {cells} cell grid")
+    return dict(space, ants=(low, min(high, cells), step))
+
+
+def simulate(point, seed, problem=PROBLEM):
+    """Run one short ACA simulation with the given parameters, and score the clustered grid.
+
+    :param point: The parameters to simulate, as returned by decode().
+    :param seed: The random seed for the simulation.
+    :param problem: The clustering problem to simulate. See PROBLEM.
+    :returns: The cluster quality of the grid after the simulation.
+    """
+    params = dict(point)
+    # Seed numba's random state too, or the ants' random walk differs from run to run.
+    _seed(seed)
+    aca = ACA(
+        (problem["width"], problem["height"]),
+        problem["colors"],
+        params["ants"],
+        params["radius"],
+        params["k1"],
+        params["k2"],
+    )
+    aca.run(problem["iterations"])
+    return aca.quality()
+
+
+def _chain(source):
+    """Get a new future that completes with the same result as the given future."""
+    future = concurrent.futures.Future()
+
+    def done(f):
+        if f.exception() is not None:
+            future.set_exception(f.exception())
+        else:
+            future.set_result(f.result())
+
+    source.add_done_callback(done)
+    return future
+
+
+def _mean(futures):
+    """Get a future that completes with the mean result of the given futures."""
+    future = concurrent.futures.Future()
+    remaining = [len(futures)]
+    # The callbacks run on whichever threads complete the futures.
+    lock = threading.Lock()
+
+    def done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] > 0:
+                return
+        try:
+            future.set_result(np.mean([f.result() for f in futures]))
+        except Exception as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+
+    for f in futures:
+        f.add_done_callback(done)
+    return future
+
+
+class CachedExecutor:
+    """Evaluate points on a grid with an executor, without ever evaluating the same point twice.
+
+    This quacks just enough like a concurrent.futures.Executor to be passed to
+    Swarm.optimize_async(). Each submitted position is rounded to a grid point. The first time a
+    point is submitted, it's evaluated once per replicate on the executor, and the point's score is
+    the mean over the replicates. After that, submitting the same point, whether or not it's
+    still being evaluated, shares the first evaluation.
+    """
+
+    def __init__(self, executor, key, replicates=1):
+        """Wrap the given executor.
+
+        :param executor: The concurrent.futures.Executor to evaluate points with.
+        :param key: A callable key(x) that rounds a position to a hashable grid point.
+        :param replicates: The number of seeds to evaluate each point with.
+        """
+        self.executor = executor
+        self.key = key
+        self.replicates = replicates
+        # Maps each grid point to the future of its score.
+        self.cache = {}
+        self.hits = 0
+
+    def submit(self, func, x):
+        """Evaluate func(point, seed) for each replicate seed, at the grid point nearest x.
+
+        :returns: A future of the mean result over the replicates.
+        """
+        point = self.key(x)
+        if point in self.cache:
+            self.hits += 1
+        else:
+            # Every point is simulated with the same seeds, so that the differences between
+            # points are due to the parameters rather than the luck of the draw.
+            futures = [self.executor.submit(func, point, s) for s in range(self.replicates)]
+            self.cache[point] = _mean(futures)
+
+        # Swarm.optimize_async() tells the particles apart by their futures, so don't hand out
+        # the same future twice.
+        return _chain(self.cache[point])
+
+    @property
+    def simulations(self):
+        """The number of evaluations actually run on the executor."""
+        return len(self.cache) * self.replicates
+
+    def results(self):
+        """Get the (point, score) pairs evaluated so far, best first."""
+        done = [(p, f.result()) for p, f in self.cache.items() if f.done() and not f.exception()]
+        return sorted(done, key=lambda r: r[1], reverse=True)
+
+
+def tune(
+    problem=PROBLEM,
+    space=SPACE,
+    particles=10,
+    evaluations=100,
+    replicates=2,
+    workers=None,
+    verbose=True,
+):
+    """Search for the ACA parameters that cluster the given problem best.
+
+    :param problem: The clustering problem to tune for. See PROBLEM.
+    :param space: The parameter bounds to search. See SPACE.
+    :param particles: The number of particles in the swarm.
+    :param evaluations: The number of particle evaluations to make. Evaluations of already
+    simulated points are free, so at most `evaluations * replicates` simulations are run.
+    :param replicates: The number of simulations to average for each parameter point.
+    :param workers: The number of worker processes. Defaults to the number of CPUs.
+    :param verbose: Whether or not to print the best parameters as they improve.
+    :returns: The best parameters as a dictionary, their score, and the CachedExecutor with every
+    evaluated point.
+    :raises ValueError: If the problem can't be simulated. See fit().
+    """
+    # Check the problem up front, rather than have a simulation fail in a worker and abort the
+    # whole search.
+    space = fit(problem, space)
+    bounds = np.array([(low, high) for low, high, _ in space.values()], dtype=float)
+    xmin, xmax = bounds[:, 0], bounds[:, 1]
+    # Cross a tenth of each dimension per iteration at most.
+    vmax = (xmax - xmin) / 10
+    swarm = Swarm(particles, 2.05, 2.05, xmin, xmax, -vmax, vmax)
+
+    func = functools.partial(simulate, problem=problem)
+    # Forking a process that has started numba's TBB threading layer can hang it, so start the
+    # workers from a fresh server process instead.
+    context = multiprocessing.get_context("forkserver")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        executor = CachedExecutor(pool, functools.partial(decode, space=space), replicates)
+        best, _, _ = swarm.optimize_async(func, evaluations, executor, verbose=verbose)
+
+    return dict(decode(best, space)), swarm.best_fitness, executor
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 import argparse
 
-from natural.ants import ACA
+import numpy as np
+
+from natural import raster
+from natural.ants import ACA, run_multiresolution
 
 # The default values given by the homework assignment.
 GRID_SIZE = (200, 200)  # (width, height)
@@ -46,12 +49,70 @@ def parse_args():
         default=[REDS, BLUES],
         help="The number of objects to use for each color.",
     )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        default=0,
+        help="The number of drop off locations each ant remembers per color.",
+    )
+    parser.add_argument(
+        "--bias",
+        type=float,
+        default=0.5,
+        help="How likely an ant with memory heads towards a remembered location.",
+    )
+    parser.add_argument(
+        "--levels",
+        type=int,
+        default=1,
+        help="Cluster coarse-to-fine on this many levels of downsampled grids. Can't be used "
+        "with --animate.",
+    )
+    parser.add_argument(
+        "--block", type=int, default=4, help="The downsampling factor between levels."
+    )
+    parser.add_argument(
+        "--active",
+        action="store_true",
+        default=False,
+        help="Only fully update the ants that are loaded or might see an object.",
+    )
+    parser.add_argument(
+        "--relocate",
+        action="store_true",
+        default=False,
+        help="With --active, relocate the ants that can't see an object near objects.",
+    )
+    parser.add_argument(
+        "--single",
+        action="store_true",
+        default=False,
+        help="Compute in single precision (float32) instead of double precision.",
+    )
+    parser.add_argument("--save", default=None, help="Save the final grid as a .png or .ppm image.")
+    parser.add_argument(
+        "--frames",
+        default=None,
+        help="Save a frame every --frame-period iterations, e.g., 'frames/aca-{:05d}.png'.",
+    )
+    parser.add_argument("--frame-period", type=int, default=10, help="How often to save a frame.")
+    parser.add_argument(
+        "--resolution",
+        nargs=2,
+        type=int,
+        default=None,
+        help="Downsample saved images larger than this width and height.",
+    )
     # Enable a headless mode so a profiler doesn't profile matplotlib (eww)
     parser.add_argument(
         "--headless", action="store_true", default=False, help="Run in headless mode for profiling."
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    # run_multiresolution() can't animate, because the coarse levels run on grids of their own.
+    if args.levels > 1 and args.animate:
+        parser.error("--animate can't be used with --levels")
+    return args
 
 
 def main(args):
@@ -62,9 +123,49 @@ def main(args):
         print("Reset period must be less than the number of iterations.")
         args.reset_period = None
 
-    alg = ACA((args.width, args.height), args.colors, args.ants, args.radius, args.k1, args.k2)
-    # Only animate when the flag is set, and not running in headless mode.
-    alg.run(args.iterations, period=args.reset_period, animate=args.animate and not args.headless)
+    dtype = np.float32 if args.single else np.float64
+    alg = ACA(
+        (args.width, args.height),
+        args.colors,
+        args.ants,
+        args.radius,
+        args.k1,
+        args.k2,
+        dtype=dtype,
+        memory=args.memory,
+        bias=args.bias,
+        active=args.active or args.relocate,
+        relocate=args.relocate,
+    )
+    recorder = None
+    if args.frames is not None:
+        recorder = raster.Recorder(
+            args.frames,
+            lambda aca: raster.render(aca.grid[:, :, 0], args.resolution),
+            period=args.frame_period,
+        )
+
+    if args.levels > 1:
+        # The iterations are spent on the coarsest level, and the finer levels get a tenth.
+        run_multiresolution(
+            alg,
+            args.iterations,
+            levels=args.levels,
+            block=args.block,
+            period=args.reset_period,
+            callback=recorder,
+        )
+    else:
+        # Only animate when the flag is set, and not running in headless mode.
+        alg.run(
+            args.iterations,
+            period=args.reset_period,
+            animate=args.animate and not args.headless,
+            callback=recorder,
+        )
+    print("cluster quality:", alg.quality())
+    if args.save is not None:
+        alg.save(args.save, args.resolution)
 
     if not args.headless:
         # TODO: Plot the initial and end grid on the same window.
@@ -1,10 +1,12 @@
 #!/usr/bin/env python3
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 
 import matplotlib.pyplot as plt
 import numpy as np
 
-from natural.particles import Swarm
+from natural import raster
+from natural.particles import Surrogate, Swarm
 
 XMIN = 0
 XMAX = 1
@@ -44,14 +46,52 @@ def parse_args():
         "--iterations", "-i", type=int, default=100, help="The number of iterations to use."
     )
 
+    parser.add_argument(
+        "--surrogate-budget",
+        type=float,
+        default=None,
+        help="Pre-screen particles with a surrogate model, and only evaluate this fraction.",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Optimize asynchronously, evaluating particles on this many threads. Can't be used "
+        "with --surrogate-budget, --frames, or --animate.",
+    )
+
     parser.add_argument(
         "--animate", action="store_true", default=False, help="Animate the swarm's progress."
     )
+    parser.add_argument(
+        "--frames",
+        default=None,
+        help="Save the swarm every --frame-period iterations, e.g., 'frames/pso-{run}-{:04d}.png'.",
+    )
+    parser.add_argument("--frame-period", type=int, default=5, help="How often to save a frame.")
+    parser.add_argument(
+        "--single",
+        action="store_true",
+        default=False,
+        help="Compute in single precision (float32) instead of double precision.",
+    )
     parser.add_argument(
         "--headless", action="store_true", default=False, help="A headless mode for profiling."
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    # The asynchronous optimization doesn't use the surrogate model, or report each iteration.
+    if args.workers is not None:
+        unsupported = {
+            "--surrogate-budget": args.surrogate_budget is not None,
+            "--frames": args.frames is not None,
+            "--animate": args.animate,
+        }
+        for flag, used in unsupported.items():
+            if used:
+                parser.error(f"{flag} can't be used with --workers")
+    return args
 
 
 def func(x):
@@ -65,7 +105,13 @@ def main(args):
     rows = 3
     _, axes = plt.subplots(rows, 2, figsize=(8, 8))
     axes = iter(axes.flatten())
-    for _ in range(rows):
+    # Keep the y axis still across frames.
+    samples = func(np.linspace(args.xmin, args.xmax, 640))
+    for run in range(rows):
+        surrogate = None
+        if args.surrogate_budget is not None:
+            surrogate = Surrogate(budget=args.surrogate_budget)
+
         swarm = Swarm(
             particles=args.particles,
             AC1=args.ac1,
@@ -74,12 +120,33 @@ def main(args):
             xmax=args.xmax,
             vmin=args.vmin,
             vmax=args.vmax,
+            surrogate=surrogate,
+            dtype=np.float32 if args.single else np.float64,
         )
-        # NOTE: Repeated calls to optimize does not reset the swarm.
-        opt, bests, means = swarm.optimize(
-            func, iters=args.iterations, animate=args.animate and not args.headless
-        )
+        if args.workers is not None:
+            # Spend the same number of evaluations as the synchronous optimization.
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                opt, bests, means = swarm.optimize_async(
+                    func, args.iterations * args.particles, executor
+                )
+        else:
+            recorder = None
+            if args.frames is not None:
+                recorder = raster.Recorder(
+                    args.frames.replace("{run}", str(run)),
+                    lambda s: raster.render_swarm(s, func, samples=samples),
+                    period=args.frame_period,
+                )
+            # NOTE: Repeated calls to optimize does not reset the swarm.
+            opt, bests, means = swarm.optimize(
+                func,
+                iters=args.iterations,
+                animate=args.animate and not args.headless,
+                callback=recorder,
+            )
         print("optimum:", opt)
+        if surrogate is not None:
+            print(f"evaluations: {surrogate.evaluations} saved: {surrogate.saved}")
 
         # TODO: Animation and results summary don't play well together.
         if not args.headless and not args.animate:
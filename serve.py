@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+
+from natural.service import JobService
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve ACA and PSO jobs from warm workers.")
+    parser.add_argument(
+        "--socket", "-s", default="natural.sock", help="The Unix socket to listen on."
+    )
+    parser.add_argument(
+        "--port", "-p", type=int, default=None, help="Listen on localhost TCP instead of a socket."
+    )
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=None,
+        help="The number of worker processes. Defaults to the number of CPUs.",
+    )
+
+    return parser.parse_args()
+
+
+def main(args):
+    print(args)
+    service = JobService(workers=args.workers)
+    if args.port is not None:
+        coro = service.serve(host="localhost", port=args.port)
+    else:
+        coro = service.serve(path=args.socket)
+
+    try:
+        asyncio.run(coro)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(parse_args())
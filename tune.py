@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import argparse
+
+from natural import tuning
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tune the ACA parameters with a particle swarm.")
+    parser.add_argument(
+        "--width", "-x", type=int, default=tuning.PROBLEM["width"], help="The width of the grid."
+    )
+    parser.add_argument(
+        "--height", "-y", type=int, default=tuning.PROBLEM["height"], help="The height of the grid."
+    )
+    parser.add_argument(
+        "--colors",
+        nargs="+",
+        type=int,
+        default=tuning.PROBLEM["colors"],
+        help="The number of objects to use for each color.",
+    )
+    parser.add_argument(
+        "--iterations",
+        "-i",
+        type=int,
+        default=tuning.PROBLEM["iterations"],
+        help="The number of iterations to run each simulation.",
+    )
+    parser.add_argument(
+        "--replicates",
+        "-r",
+        type=int,
+        default=2,
+        help="The number of simulations to average for each parameter point.",
+    )
+    parser.add_argument(
+        "--particles", "-p", type=int, default=10, help="The number of particles in the swarm."
+    )
+    parser.add_argument(
+        "--evaluations",
+        "-e",
+        type=int,
+        default=100,
+        help="The number of parameter points the swarm evaluates.",
+    )
+    parser.add_argument(
+        "--workers", "-w", type=int, default=None, help="The number of worker processes."
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="The number of best parameter points to print."
+    )
+
+    args = parser.parse_args()
+    try:
+        tuning.fit(problem(args))
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def problem(args):
+    """Get the clustering problem to tune for from the command line arguments."""
+    return {
+        "width": args.width,
+        "height": args.height,
+        "colors": args.colors,
+        "iterations": args.iterations,
+    }
+
+
+def main(args):
+    print(args)
+    best, quality, executor = tuning.tune(
+        problem(args),
+        particles=args.particles,
+        evaluations=args.evaluations,
+        replicates=args.replicates,
+        workers=args.workers,
+    )
+    print(f"simulations: {executor.simulations} cache hits: {executor.hits}")
+    for point, score in executor.results()[: args.top]:
+        print(f"{score:.4f}", " ".join(f"--{name} {value}" for name, value in point))
+    print("best:", best, "cluster quality:", quality)
+
+
+if __name__ == "__main__":
+    main(parse_args())